@@ -1,14 +1,26 @@
 import sqlite3
+import inspect
 import functools
 from datetime import datetime  # ✅ required import
 
 
+def _log(args, kwargs):
+    query = kwargs.get('query') or (args[0] if args else '')
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[LOG][{timestamp}] Executing query: {query}")
+
+
 def log_queries(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            _log(args, kwargs)
+            return await func(*args, **kwargs)
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        query = kwargs.get('query') or (args[0] if args else '')
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[LOG][{timestamp}] Executing query: {query}")
+        _log(args, kwargs)
         return func(*args, **kwargs)
     return wrapper
 
@@ -23,6 +35,6 @@ def fetch_all_users(query):
     return results
 
 
-# Example usage
-users = fetch_all_users(query="SELECT * FROM users")
-print(users)
+if __name__ == "__main__":
+    users = fetch_all_users(query="SELECT * FROM users")
+    print(users)
@@ -1,28 +1,13 @@
-import sqlite3
-import functools
-from datetime import datetime  # ✅ required import
+from db_pool import with_db_connection
 
 
-def log_queries(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        query = kwargs.get('query') or (args[0] if args else '')
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[LOG][{timestamp}] Executing query: {query}")
-        return func(*args, **kwargs)
-    return wrapper
-
-
-@log_queries
-def fetch_all_users(query):
-    conn = sqlite3.connect('users.db')
+@with_db_connection
+def get_user_by_id(conn, user_id):
     cursor = conn.cursor()
-    cursor.execute(query)
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+    return cursor.fetchone()
 
 
-# Example usage
-users = fetch_all_users(query="SELECT * FROM users")
-print(users)
+if __name__ == "__main__":
+    user = get_user_by_id(user_id=1)
+    print(user)
@@ -1,29 +1,48 @@
-import sqlite3
+import inspect
 import functools
 
-
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
-        try:
-            return func(conn, *args, **kwargs)
-        finally:
-            conn.close()
-    return wrapper
+from db_pool import with_db_connection
+from query_cache import invalidate_tables, written_tables
 
 
 def transactional(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(conn, *args, **kwargs):
+            written = set()
+            await conn.set_trace_callback(
+                lambda sql: written.update(written_tables(sql)))
+            try:
+                result = await func(conn, *args, **kwargs)
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                print(f"[ERROR] Transaction failed: {e}")
+                raise
+            finally:
+                await conn.set_trace_callback(None)
+            invalidate_tables(written)
+            return result
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
+        # Note the tables every statement writes, so cached reads of them
+        # can be dropped once the transaction has committed.
+        written = set()
+        conn.set_trace_callback(
+            lambda sql: written.update(written_tables(sql)))
         try:
             result = func(conn, *args, **kwargs)
             conn.commit()
-            return result
         except Exception as e:
             conn.rollback()
             print(f"[ERROR] Transaction failed: {e}")
             raise
+        finally:
+            conn.set_trace_callback(None)
+        invalidate_tables(written)
+        return result
     return wrapper
 
 
@@ -35,4 +54,5 @@ def update_user_email(conn, user_id, new_email):
                    (new_email, user_id))
 
 
-update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
+if __name__ == "__main__":
+    update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
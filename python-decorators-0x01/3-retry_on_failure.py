@@ -1,33 +1,45 @@
-import time
-import sqlite3
+import inspect
 import functools
 
+from db_pool import with_db_connection
+from retry import CircuitBreaker, Retry, is_transient
 
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
-        try:
-            return func(conn, *args, **kwargs)
-        finally:
-            conn.close()
-    return wrapper
+_NEW_BREAKER = object()
 
 
-def retry_on_failure(retries=3, delay=2):
+def _report(attempt, error, wait):
+    print(f"[RETRY] Attempt {attempt} failed: {error}; "
+          f"retrying in {wait:.2f}s")
+
+
+def retry_on_failure(retries=3, delay=2, max_delay=30, max_elapsed=None,
+                     retry_on=is_transient, breaker=_NEW_BREAKER):
+    """
+    Retry transient failures (a locked or busy database by default).
+
+    Waits back off exponentially from *delay* seconds with full jitter,
+    capped at *max_delay*; *max_elapsed* bounds the total time. Each
+    decorated function gets its own CircuitBreaker unless one is passed
+    in (shared) or *breaker* is None (disabled).
+    """
     def decorator(func):
+        policy = Retry(
+            attempts=retries, base_delay=delay, max_delay=max_delay,
+            max_elapsed=max_elapsed, retry_on=retry_on,
+            breaker=CircuitBreaker() if breaker is _NEW_BREAKER else breaker,
+            on_retry=_report)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await policy.acall(func, *args, **kwargs)
+            async_wrapper.retry_policy = policy
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            for attempt in range(1, retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    print(f"[RETRY] Attempt {attempt} failed: {e}")
-                    if attempt < retries:
-                        time.sleep(delay)
-                    else:
-                        print("[RETRY] All attempts failed.")
-                        raise
+            return policy.call(func, *args, **kwargs)
+        wrapper.retry_policy = policy
         return wrapper
     return decorator
 
@@ -40,5 +52,6 @@ def fetch_users_with_retry(conn):
     return cursor.fetchall()
 
 
-users = fetch_users_with_retry()
-print(users)
+if __name__ == "__main__":
+    users = fetch_users_with_retry()
+    print(users)
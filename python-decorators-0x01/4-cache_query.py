@@ -1,40 +1,89 @@
-import sqlite3
+import inspect
 import functools
 
-query_cache = {}
+from db_pool import with_db_connection
+from query_cache import QueryCache, written_tables
 
+# Up to 256 results, 16 MiB in total, each for at most five minutes;
+# transactional writes to a table drop its entries immediately.
+query_cache = QueryCache(max_entries=256, max_bytes=16 * 2**20, ttl=300)
+
+
+def _copy(rows):
+    # Callers may modify the list they get back; the cached one must not.
+    return list(rows) if isinstance(rows, list) else rows
+
+
+def _query_and_params(args, kwargs):
+    query = kwargs.get('query', args[0] if args else '')
+    params = kwargs.get('params', args[1] if len(args) > 1 else ())
+    return query, params
 
-def with_db_connection(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        conn = sqlite3.connect('users.db')
-        try:
-            return func(conn, *args, **kwargs)
-        finally:
-            conn.close()
-    return wrapper
 
+def cache_query(func=None, *, cache=None, ttl=..., timeout=None):
+    """
+    Cache the result of ``func(conn, query, params=())`` in a QueryCache.
+
+    Use bare (``@cache_query``) or with options
+    (``@cache_query(cache=my_cache, ttl=30, timeout=5)``). Concurrent
+    misses for the same query run it once; the other callers wait up to
+    *timeout* seconds for that result. Statements that write are never
+    cached. Coroutine functions are cached the same way, waiting callers
+    awaiting the running query.
+    """
+    if func is None:
+        return functools.partial(cache_query, cache=cache, ttl=ttl,
+                                 timeout=timeout)
+    store = query_cache if cache is None else cache
+    options = {} if ttl is ... else {"ttl": ttl}
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(conn, *args, **kwargs):
+            query, params = _query_and_params(args, kwargs)
+            if written_tables(query):
+                return await func(conn, *args, **kwargs)
+            ran = []
+
+            async def load():
+                ran.append(True)
+                return _copy(await func(conn, *args, **kwargs))
+
+            result = await store.aget_or_load(
+                QueryCache.make_key(query, params), load,
+                timeout=timeout, **options)
+            if not ran:
+                print("[CACHE] Returning cached result.")
+            return _copy(result)
+        return async_wrapper
 
-def cache_query(func):
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
-        query = kwargs.get('query') or (args[1] if len(args) > 1 else '')
-        if query in query_cache:
+        query, params = _query_and_params(args, kwargs)
+        if written_tables(query):
+            return func(conn, *args, **kwargs)
+        ran = []
+
+        def load():
+            ran.append(True)
+            return _copy(func(conn, *args, **kwargs))
+
+        result = store.get_or_load(QueryCache.make_key(query, params), load,
+                                   timeout=timeout, **options)
+        if not ran:
             print("[CACHE] Returning cached result.")
-            return query_cache[query]
-        result = func(conn, *args, **kwargs)
-        query_cache[query] = result
-        return result
+        return _copy(result)
     return wrapper
 
 
 @with_db_connection
 @cache_query
-def fetch_users_with_cache(conn, query):
+def fetch_users_with_cache(conn, query, params=()):
     cursor = conn.cursor()
-    cursor.execute(query)
+    cursor.execute(query, params)
     return cursor.fetchall()
 
 
-users = fetch_users_with_cache(query="SELECT * FROM users")
-users_again = fetch_users_with_cache(query="SELECT * FROM users")
+if __name__ == "__main__":
+    users = fetch_users_with_cache(query="SELECT * FROM users")
+    users_again = fetch_users_with_cache(query="SELECT * FROM users")
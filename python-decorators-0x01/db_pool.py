@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+db_pool.py – Thread-safe pool of SQLite connections for the decorators.
+
+Opening a connection per call re-reads the schema and starts with a cold
+page cache and statement cache every time. The pool keeps up to
+``max_size`` connections open and hands them out in turn: a thread gets
+back the connection it used last whenever that one is free (per-thread
+affinity), so its prepared statements and cached pages stay warm.
+
+Connections are opened with ``check_same_thread=False`` because the pool,
+not sqlite3, guarantees only one thread uses a connection at a time. A
+connection released inside an open transaction is rolled back before it
+is reused.
+
+Optional PRAGMAs run once, when a connection is opened; FAST_PRAGMAS is
+a WAL setup suited to concurrent readers. ``journal_mode = wal`` persists
+in the database file, so it is opt-in.
+
+Coroutines decorated with with_db_connection get an aiosqlite connection
+from ``pool.async_connection()`` instead. Up to ``max_size`` of those are
+kept open between calls; concurrent callers beyond that get a connection
+of their own that is closed afterwards. aiosqlite is optional; it is
+needed only for async functions.
+
+Functions
+---------
+configure(database, ...)  ➜ replaces the shared pool
+get_pool()                ➜ the shared pool (users.db by default)
+with_db_connection(func)  ➜ calls func(conn, ...) with a pooled connection
+"""
+
+import functools
+import inspect
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from typing import (Any, AsyncIterator, Callable, Iterator, List, Mapping,
+                    Optional)
+
+try:
+    import aiosqlite
+except ImportError:  # optional dependency
+    aiosqlite = None
+
+DEFAULT_DATABASE = os.environ.get("USERS_DB", "users.db")
+
+FAST_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",     # durable at checkpoints, safe with WAL
+    "mmap_size": 256 * 2**20,
+    "cache_size": -16_000,       # negative: KiB rather than pages
+}
+
+_DEFAULT = object()
+
+
+class SQLitePool:
+    """
+    Bounded pool of sqlite3 connections to one database file.
+
+    Parameters
+    ----------
+    database : str
+        Path of the database file.
+    max_size : int
+        Most connections open at once; callers beyond it wait.
+    timeout : float
+        Seconds acquire() waits for a free connection before TimeoutError.
+    cached_statements : int
+        Size of each connection's prepared statement cache.
+    pragmas : mapping, optional
+        ``{name: value}`` run as ``PRAGMA name = value`` on every new
+        connection, e.g. FAST_PRAGMAS.
+    """
+
+    def __init__(self, database: str = DEFAULT_DATABASE, max_size: int = 8,
+                 timeout: float = 5.0, cached_statements: int = 256,
+                 pragmas: Optional[Mapping[str, Any]] = None) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        for name, value in (pragmas or {}).items():
+            if not re.fullmatch(r"\w+", name) \
+                    or not re.fullmatch(r"-?\w+", str(value)):
+                raise ValueError(f"Invalid pragma: {name} = {value}")
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.pragmas = dict(pragmas or {})
+        self.stats: Counter = Counter()
+        self._idle: List[sqlite3.Connection] = []
+        self._async_idle: list = []
+        self._size = 0
+        self._closed = False
+        self._local = threading.local()
+        self._cond = threading.Condition()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        try:
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def acquire(self, timeout: Any = _DEFAULT) -> sqlite3.Connection:
+        """Take a connection, preferring the one this thread used last."""
+        timeout = self.timeout if timeout is _DEFAULT else timeout
+        deadline = time.monotonic() + timeout
+        mine = getattr(self._local, "conn", None)
+        conn = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("The pool is closed")
+                if self._idle:
+                    if mine is not None and mine in self._idle:
+                        self._idle.remove(mine)
+                        conn = mine
+                        self.stats["affine"] += 1
+                    else:
+                        conn = self._idle.pop()
+                    self.stats["reused"] += 1
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise TimeoutError(
+                        f"No free connection to {self.database} "
+                        f"after {timeout}s")
+                self.stats["waits"] += 1
+                self._cond.wait(remaining)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.stats["created"] += 1
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Give *conn* back, rolling back anything left uncommitted."""
+        keep = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            keep = False
+        with self._cond:
+            if keep and not self._closed:
+                self._idle.append(conn)
+            else:
+                self._size -= 1
+                conn.close()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """``with pool.connection() as conn:`` – acquire and release."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @asynccontextmanager
+    async def async_connection(self) -> AsyncIterator[Any]:
+        """``async with pool.async_connection() as conn:`` – aiosqlite."""
+        if aiosqlite is None:
+            raise ImportError("aiosqlite is required for async functions")
+        with self._cond:
+            if self._closed:
+                raise sqlite3.ProgrammingError("The pool is closed")
+            conn = self._async_idle.pop() if self._async_idle else None
+        if conn is None:
+            conn = await aiosqlite.connect(
+                self.database, cached_statements=self.cached_statements)
+            try:
+                for name, value in self.pragmas.items():
+                    await conn.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error:
+                await conn.close()
+                raise
+            with self._cond:
+                self.stats["created"] += 1
+        try:
+            yield conn
+        finally:
+            keep = True
+            try:
+                if conn.in_transaction:
+                    await conn.rollback()
+            except sqlite3.Error:
+                keep = False
+            with self._cond:
+                if (keep and not self._closed
+                        and len(self._async_idle) < self.max_size):
+                    self._async_idle.append(conn)
+                    conn = None
+            if conn is not None:
+                await conn.close()
+
+    def close(self) -> None:
+        """Close the idle connections; busy ones close when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+    async def aclose(self) -> None:
+        """close(), then close the idle aiosqlite connections too."""
+        self.close()
+        with self._cond:
+            idle, self._async_idle = self._async_idle, []
+        for conn in idle:
+            await conn.close()
+
+
+_pool: Optional[SQLitePool] = None
+_pool_lock = threading.Lock()
+
+
+def configure(database: str = DEFAULT_DATABASE, **options: Any) -> SQLitePool:
+    """Replace the shared pool (closing the old one); see SQLitePool."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, SQLitePool(database, **options)
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def get_pool() -> SQLitePool:
+    """The shared pool, created on first use with the defaults."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SQLitePool()
+        return _pool
+
+
+def with_db_connection(func: Callable) -> Callable:
+    """Call ``func(conn, *args, **kwargs)`` with a connection from the pool."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            async with get_pool().async_connection() as conn:
+                return await func(conn, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_pool().connection() as conn:
+            return func(conn, *args, **kwargs)
+    return wrapper
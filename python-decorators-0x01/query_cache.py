@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+query_cache.py – Bounded LRU/TTL cache for query results.
+
+Entries are keyed by the normalized SQL text plus the bound parameters,
+so ``select * from users where id = ?`` with ``(1,)`` and with ``(2,)``
+are different entries while whitespace and keyword case do not matter.
+A cache is bounded by entry count and optionally by (estimated) bytes;
+the least recently used entries go first. Entries can also expire after
+a TTL.
+
+Every entry remembers the tables its query reads. ``invalidate_tables``
+drops the matching entries from every cache in the process; the
+``transactional`` decorator calls it with the tables a transaction wrote
+once that transaction has committed. Writes made by other processes are
+only bounded by the TTL.
+
+``QueryCache.get_or_load`` coalesces concurrent misses (single flight):
+the first caller missing a key runs the query, later callers for the same
+key wait for its result instead of running the same SQL again.
+``aget_or_load`` does the same for coroutines, waiters awaiting the
+leader's future on the same event loop.
+
+Functions
+---------
+normalize_sql(sql)        ➜ canonical SQL text used in cache keys
+tables_read(sql)          ➜ tables a query reads
+written_tables(sql)       ➜ tables a statement writes
+invalidate_tables(names)  ➜ drops matching entries from every cache
+"""
+
+import asyncio
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from typing import (Any, Awaitable, Callable, Hashable, Iterable, NamedTuple,
+                    Optional, Set, Tuple)
+
+ANY_TABLE = "*"        # the query's tables could not be determined
+
+_DEFAULT = object()
+
+_LITERAL = re.compile(r"('(?:[^']|'')*')")   # "x" is an identifier
+_SOURCES = re.compile(
+    r'\b(?:from|join)\s+("?[\w.]+"?(?:\s+(?:as\s+)?\w+)?'
+    r'(?:\s*,\s*"?[\w.]+"?(?:\s+(?:as\s+)?\w+)?)*)')
+_WRITE = re.compile(
+    r'^(?:insert(?:\s+or\s+\w+)?\s+into|replace\s+into'
+    r'|update(?:\s+or\s+\w+)?|delete\s+from'
+    r'|(?:create|drop|alter)\s+table(?:\s+if(?:\s+not)?\s+exists)?)'
+    r'\s+("?[\w.]+"?)')
+_WRITE_VERBS = ("insert", "update", "delete", "replace", "create", "drop",
+                "alter")
+
+_caches: "weakref.WeakSet[QueryCache]" = weakref.WeakSet()
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and fold case outside string literals."""
+    parts = _LITERAL.split(sql.strip().rstrip(";"))
+    for i in range(0, len(parts), 2):      # even parts are not literals
+        parts[i] = re.sub(r"\s+", " ", parts[i]).lower()
+    return "".join(parts).strip()
+
+
+def _table(name: str) -> str:
+    return name.strip('"').rsplit(".", 1)[-1].lower()
+
+
+def tables_read(sql: str) -> Set[str]:
+    """Tables named in the FROM / JOIN clauses of *sql*."""
+    sql = _LITERAL.sub("''", normalize_sql(sql))
+    tables = set()
+    for sources in _SOURCES.findall(sql):
+        for source in sources.split(","):
+            tables.add(_table(source.split()[0]))
+    return tables or {ANY_TABLE}
+
+
+def written_tables(sql: str) -> Set[str]:
+    """Tables *sql* modifies; ANY_TABLE if it writes somewhere unknown."""
+    sql = _LITERAL.sub("''", normalize_sql(sql))
+    match = _WRITE.match(sql)
+    if match:
+        return {_table(match.group(1))}
+    words = set(re.findall(r"[a-z]+", sql))
+    if sql.startswith("with") and words & set(_WRITE_VERBS):
+        return {ANY_TABLE}
+    return set()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Bound parameters as a hashable key part."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate bytes held by a result (rows of scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for row in value:
+            size += sys.getsizeof(row)
+            if isinstance(row, (list, tuple)):
+                size += sum(sys.getsizeof(field) for field in row)
+    return size
+
+
+class _Entry(NamedTuple):
+    value:   Any
+    size:    int
+    expires: float            # monotonic deadline, inf for no TTL
+    tables:  frozenset
+
+
+class _Flight:
+    """One in-progress load that other callers can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results with optional TTL.
+
+    Parameters
+    ----------
+    max_entries : int
+        Most entries kept; the least recently used is evicted first.
+    max_bytes : int, optional
+        Bound on the estimated size of all cached results. A single result
+        larger than this is not cached.
+    ttl : float, optional
+        Default seconds an entry stays valid (None: until evicted).
+    clock : callable, optional
+        Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(self, max_entries: int = 1024,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats: Counter = Counter()
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._by_table: dict = {}
+        self._bytes = 0
+        self._flights: dict = {}
+        self._async_flights: dict = {}    # (event loop, key) -> Future
+        self._generation = 0      # bumped by every invalidation
+        self._lock = threading.RLock()
+        _caches.add(self)
+
+    @staticmethod
+    def make_key(sql: str, params: Any = ()) -> Tuple[str, Hashable]:
+        """Cache key for *sql* executed with *params*."""
+        return normalize_sql(sql), _freeze(params or ())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated bytes held by the cached results."""
+        return self._bytes
+
+    def lookup(self, key: tuple) -> Tuple[bool, Any]:
+        """``(True, value)`` for a live entry, else ``(False, None)``."""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            self.stats["hits"] += 1
+            return True, entry.value
+
+    def get_or_load(self, key: tuple, load: Callable[[], Any],
+                    ttl: Any = _DEFAULT,
+                    timeout: Optional[float] = None) -> Any:
+        """
+        Cached value for *key*, calling *load* at most once per miss.
+
+        Concurrent callers missing the same key wait for the first one's
+        *load* and share its result or exception (counted as "coalesced").
+        A waiter gives up with TimeoutError after *timeout* seconds.
+        A result loaded while its tables were invalidated is returned but
+        not cached, since it may predate the write.
+        """
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return entry.value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                with self._lock:
+                    self.stats["timeouts"] += 1
+                raise TimeoutError(f"Gave up waiting for: {key[0]}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = load()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and generation == self._generation:
+                    self.put(key, flight.value, ttl)
+            flight.done.set()
+        return flight.value
+
+    async def aget_or_load(self, key: tuple,
+                           load: Callable[[], Awaitable[Any]],
+                           ttl: Any = _DEFAULT,
+                           timeout: Optional[float] = None) -> Any:
+        """Coroutine version of get_or_load; *load* returns an awaitable."""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return entry.value
+            future = self._async_flights.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[flight_key] = loop.create_future()
+                generation = self._generation
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self.stats["timeouts"] += 1
+                raise TimeoutError(f"Gave up waiting for: {key[0]}") from None
+
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()          # retrieved, even if nobody waits
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                del self._async_flights[flight_key]
+                if (not future.cancelled() and future.exception() is None
+                        and generation == self._generation):
+                    self.put(key, future.result(), ttl)
+        return value
+
+    def put(self, key: tuple, value: Any, ttl: Any = _DEFAULT) -> None:
+        """Store *value* under *key* (for *ttl* seconds, default self.ttl)."""
+        ttl = self.ttl if ttl is _DEFAULT else ttl
+        size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = float("inf") if ttl is None else self._clock() + ttl
+        entry = _Entry(value, size, expires, frozenset(tables_read(key[0])))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for table in entry.tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while (len(self._entries) > self.max_entries
+                   or self.max_bytes is not None
+                   and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.stats["evicted"] += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """Drop entries reading any of *tables*; return how many."""
+        tables = {_table(name) for name in tables}
+        if not tables:
+            return 0
+        with self._lock:
+            if ANY_TABLE in tables:
+                keys = set(self._entries)
+            else:
+                keys = set(self._by_table.get(ANY_TABLE, ()))
+                for table in tables:
+                    keys |= self._by_table.get(table, set())
+            for key in keys:
+                self._remove(key)
+            self._generation += 1
+            self.stats["invalidated"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+            self._generation += 1
+
+    def _live(self, key: tuple) -> Optional[_Entry]:
+        """The unexpired entry for *key*, refreshed as most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= self._clock():
+            self._remove(key)
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: tuple) -> None:
+        """Drop one entry and its table index; caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+
+def invalidate_tables(tables: Iterable[str]) -> int:
+    """Drop entries reading any of *tables* from every QueryCache."""
+    tables = set(tables)
+    return sum(cache.invalidate_tables(tables) for cache in list(_caches))
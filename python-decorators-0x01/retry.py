@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+retry.py – Retry engine for transient SQLite errors.
+
+Only errors that can succeed on a later attempt are retried: by default
+``sqlite3.OperationalError`` reporting a locked or busy database. Other
+errors (syntax errors, missing tables, bugs in the caller) are raised at
+once.
+
+Waits grow exponentially with *full jitter*: attempt n sleeps a random
+time in ``[0, min(max_delay, base_delay * 2**(n-1))]``, so callers that
+hit the same lock at the same moment spread out instead of coming back
+together. An optional ``max_elapsed`` budget bounds the total time spent.
+
+A CircuitBreaker shared by the calls to one function opens after
+``failure_threshold`` consecutive transient failures; calls then fail
+fast with CircuitOpenError until ``reset_timeout`` has passed, when one
+trial call is let through to close it again.
+
+Functions
+---------
+is_transient(exc)            ➜ True for errors worth retrying
+Retry(...).call(func, ...)   ➜ func's result, retried per the policy
+Retry(...).acall(func, ...)  ➜ the same for coroutine functions
+"""
+
+import asyncio
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+_TRANSIENT = re.compile(r"\b(?:locked|busy)\b", re.IGNORECASE)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for lock contention errors, which may succeed when retried."""
+    return (isinstance(exc, sqlite3.OperationalError)
+            and bool(_TRANSIENT.search(str(exc))))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated transient failures.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Consecutive failures that open the circuit.
+    reset_timeout : float
+        Seconds the circuit stays open before one trial call is allowed.
+    clock : callable, optional
+        Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(self, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._clock = clock
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half-open"``."""
+        if self._opened_at is None:
+            return "closed"
+        if (self._trial or self._clock() - self._opened_at
+                < self.reset_timeout):
+            return "open"
+        return "half-open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = self._clock() - self._opened_at
+            if self._trial or waited < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit open after {self.failures} failures")
+            self._trial = True          # half-open: one call goes through
+
+    def record_success(self) -> None:
+        """The call reached the database: close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+class Retry:
+    """
+    Retry policy: attempts, backoff, time budget, error classifier.
+
+    Parameters
+    ----------
+    attempts : int
+        Calls made at most, the first one included.
+    base_delay, max_delay : float
+        Backoff cap for attempt n is min(max_delay, base_delay * 2**(n-1));
+        the actual wait is uniform between 0 and that cap.
+    max_elapsed : float, optional
+        Do not start a wait that would end more than this many seconds
+        after the first call.
+    retry_on : callable
+        ``retry_on(exc)`` is True for errors worth retrying.
+    breaker : CircuitBreaker, optional
+        Consulted before and updated after every attempt.
+    on_retry : callable, optional
+        ``on_retry(attempt, exc, delay)`` before each wait.
+    sleep, clock, rng
+        Replaceable in tests.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.1,
+                 max_delay: float = 5.0, max_elapsed: Optional[float] = None,
+                 retry_on: Callable[[BaseException], bool] = is_transient,
+                 breaker: Optional[CircuitBreaker] = None,
+                 on_retry: Optional[Callable[[int, Exception, float],
+                                             Any]] = None,
+                 sleep: Callable[[float], Any] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic,
+                 rng: Callable[[], float] = random.random) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.retry_on = retry_on
+        self.breaker = breaker
+        self.on_retry = on_retry
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng
+
+    def _before(self) -> None:
+        if self.breaker is not None:
+            self.breaker.before_call()
+
+    def _failed(self, attempt: int, started: float,
+                exc: Exception) -> Optional[float]:
+        """The wait before the next attempt, or None to give up."""
+        transient = self.retry_on(exc)
+        if self.breaker is not None:
+            # Only transient errors say anything about the database's
+            # health; any other error means it answered.
+            if transient:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        if not transient or attempt >= self.attempts:
+            return None
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self._rng() * cap
+        if (self.max_elapsed is not None
+                and self._clock() - started + delay > self.max_elapsed):
+            return None
+        if self.on_retry is not None:
+            self.on_retry(attempt, exc, delay)
+        return delay
+
+    def _succeeded(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Call ``func(*args, **kwargs)``, retrying per the policy."""
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                delay = self._failed(attempt, started, exc)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+            else:
+                self._succeeded()
+                return result
+
+    async def acall(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Await ``func(*args, **kwargs)``, retrying with asyncio.sleep."""
+        started = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as exc:
+                delay = self._failed(attempt, started, exc)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self._succeeded()
+                return result
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Unit tests for the coroutine branches of the DB decorators."""
+
+import asyncio
+import importlib
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import db_pool
+from query_cache import QueryCache
+
+log_queries = importlib.import_module("0-log_queries").log_queries
+transactional = importlib.import_module("2-transactional").transactional
+retry_on_failure = importlib.import_module(
+    "3-retry_on_failure").retry_on_failure
+cache_query = importlib.import_module("4-cache_query").cache_query
+
+
+class FakeAsyncConnection:
+    """Records the awaited transaction calls of an aiosqlite connection."""
+
+    def __init__(self):
+        self.calls = []
+        self.trace = None
+
+    async def execute(self, sql):
+        if self.trace is not None:
+            self.trace(sql)
+
+    async def set_trace_callback(self, handler):
+        self.trace = handler
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+
+class TestAsyncDecorators(unittest.TestCase):
+    """Test suite for async def targets of every decorator."""
+
+    def test_log_queries_awaits(self):
+        """The coroutine is awaited, not returned un-awaited."""
+        @log_queries
+        async def fetch(query):
+            return [query]
+
+        self.assertTrue(asyncio.iscoroutinefunction(fetch))
+        self.assertEqual(asyncio.run(fetch(query="SELECT 1")), ["SELECT 1"])
+
+    def test_retry_uses_asyncio_sleep(self):
+        """Failures are retried with a non-blocking sleep."""
+        attempts = []
+
+        @retry_on_failure(retries=3, delay=0.5)
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return "ok"
+
+        sleeps = []
+
+        async def no_sleep(delay):
+            sleeps.append(delay)
+
+        with patch("asyncio.sleep", no_sleep):
+            self.assertEqual(asyncio.run(flaky()), "ok")
+        self.assertEqual(len(sleeps), 2)
+        self.assertTrue(0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0)
+
+    def test_transactional_commits_and_invalidates(self):
+        """Commit is awaited and cached reads of the table are dropped."""
+        cache = QueryCache()
+        key = QueryCache.make_key("SELECT * FROM users")
+        cache.put(key, [])
+        conn = FakeAsyncConnection()
+
+        @transactional
+        async def update(conn):
+            await conn.execute("UPDATE users SET email = 'x'")
+
+        asyncio.run(update(conn))
+        self.assertEqual(conn.calls, ["commit"])
+        self.assertIsNone(conn.trace)
+        self.assertEqual(len(cache), 0)
+
+    def test_transactional_rolls_back(self):
+        """An exception rolls the transaction back and propagates."""
+        conn = FakeAsyncConnection()
+
+        @transactional
+        async def failing(conn):
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(failing(conn))
+        self.assertEqual(conn.calls, ["rollback"])
+
+    def test_cache_query_coalesces_concurrent_awaits(self):
+        """Concurrent awaits of one query run it once."""
+        cache = QueryCache()
+        runs = []
+
+        @cache_query(cache=cache)
+        async def fetch(conn, query):
+            runs.append(query)
+            await asyncio.sleep(0.01)
+            return [("row",)]
+
+        async def main():
+            return await asyncio.gather(
+                *(fetch(None, "SELECT * FROM users") for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [[("row",)]] * 5)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(cache.stats["coalesced"], 4)
+        asyncio.run(fetch(None, "select *  from users"))
+        self.assertEqual(cache.stats["hits"], 1)
+
+    def test_cache_waiter_timeout(self):
+        """A waiter stops after its timeout; the leader completes."""
+        cache = QueryCache()
+
+        @cache_query(cache=cache, timeout=0.01)
+        async def fetch(conn, query):
+            await asyncio.sleep(0.1)
+            return []
+
+        async def main():
+            leader = asyncio.ensure_future(fetch(None, "SELECT 1"))
+            await asyncio.sleep(0)
+            with self.assertRaises(TimeoutError):
+                await fetch(None, "SELECT 1")
+            return await leader
+
+        self.assertEqual(asyncio.run(main()), [])
+        self.assertEqual(cache.stats["timeouts"], 1)
+
+    @unittest.skipIf(db_pool.aiosqlite is None, "aiosqlite not installed")
+    def test_with_db_connection_reuses_aiosqlite(self):
+        """Async calls get pooled aiosqlite connections."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        pool = db_pool.SQLitePool(os.path.join(tmp.name, "users.db"))
+
+        @db_pool.with_db_connection
+        async def one(conn):
+            async with conn.execute("SELECT 1") as cursor:
+                return await cursor.fetchone()
+
+        async def main():
+            results = [await one(), await one()]
+            await pool.aclose()
+            return results
+
+        with patch.object(db_pool, "_pool", pool):
+            self.assertEqual(asyncio.run(main()), [(1,), (1,)])
+        self.assertEqual(pool.stats["created"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
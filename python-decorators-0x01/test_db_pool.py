@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Unit tests for db_pool.SQLitePool and the pooled with_db_connection."""
+
+import importlib
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import db_pool
+from db_pool import FAST_PRAGMAS, SQLitePool
+
+
+class TestSQLitePool(unittest.TestCase):
+    """Test suite for SQLitePool."""
+
+    def setUp(self):
+        """A users table in a scratch database file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.db")
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("CREATE TABLE users (id INTEGER, email TEXT)")
+            conn.execute("INSERT INTO users VALUES (1, 'a@x')")
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_thread_gets_its_connection_back(self):
+        """Sequential calls in one thread reuse the same connection."""
+        pool = SQLitePool(self.path)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            self.assertIs(first, second)
+        self.assertEqual((pool.stats["created"], pool.stats["affine"]),
+                         (1, 1))
+        pool.close()
+
+    def test_threads_keep_their_own_connections(self):
+        """With two threads alternating, each sticks to its connection."""
+        pool = SQLitePool(self.path, max_size=2)
+        seen = {"a": set(), "b": set()}
+        barrier = threading.Barrier(2)
+
+        def work(name):
+            for _ in range(5):
+                barrier.wait()
+                with pool.connection() as conn:
+                    seen[name].add(id(conn))
+                    barrier.wait()
+
+        threads = [threading.Thread(target=work, args=(name,))
+                   for name in seen]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([len(ids) for ids in seen.values()], [1, 1])
+        self.assertNotEqual(seen["a"], seen["b"])
+        pool.close()
+
+    def test_exhausted_pool_times_out(self):
+        """Callers beyond max_size wait, then get TimeoutError."""
+        pool = SQLitePool(self.path, max_size=1, timeout=0.01)
+        with pool.connection():
+            with self.assertRaises(TimeoutError):
+                pool.acquire()
+        self.assertEqual(pool.stats["timeouts"], 1)
+        pool.close()
+
+    def test_uncommitted_work_is_rolled_back(self):
+        """A connection released mid-transaction comes back clean."""
+        pool = SQLitePool(self.path)
+        with pool.connection() as conn:
+            conn.execute("DELETE FROM users")
+        with pool.connection() as conn:
+            self.assertFalse(conn.in_transaction)
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM users").fetchone(), (1,))
+        pool.close()
+
+    def test_pragmas_run_once_per_connection(self):
+        """FAST_PRAGMAS switch the database to WAL; bad names are refused."""
+        pool = SQLitePool(self.path, pragmas=FAST_PRAGMAS)
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone(),
+                             ("wal",))
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone(),
+                             (1,))
+        pool.close()
+        with self.assertRaises(ValueError):
+            SQLitePool(self.path, pragmas={"cache_size; DROP": 1})
+
+    def test_closed_pool(self):
+        """After close() nothing is handed out; busy ones close on release."""
+        pool = SQLitePool(self.path)
+        conn = pool.acquire()
+        pool.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            pool.acquire()
+        pool.release(conn)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_decorators_use_the_shared_pool(self):
+        """with_db_connection and transactional run on the configured pool."""
+        with patch.object(db_pool, "_pool", None):
+            pool = db_pool.configure(self.path)
+            self.addCleanup(pool.close)
+            self.run_decorated(pool)
+
+    def run_decorated(self, pool):
+        """Update and read back a user through the task modules."""
+        transactional = importlib.import_module("2-transactional")
+        get_user_by_id = importlib.import_module(
+            "1-with_db_connection").get_user_by_id
+
+        transactional.update_user_email(user_id=1, new_email="b@x")
+        self.assertEqual(get_user_by_id(user_id=1), (1, "b@x"))
+        self.assertEqual(pool.stats["created"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Unit tests for query_cache and the decorators that use it."""
+
+import importlib
+import sqlite3
+import threading
+import unittest
+
+from parameterized import parameterized
+
+import query_cache
+from query_cache import ANY_TABLE, QueryCache
+
+transactional = importlib.import_module("2-transactional").transactional
+cache_module = importlib.import_module("4-cache_query")
+
+
+class FakeClock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSqlParsing(unittest.TestCase):
+    """Test suite for key normalization and table extraction."""
+
+    def test_normalize_keeps_literals(self):
+        """Whitespace and case fold outside quotes only."""
+        self.assertEqual(
+            query_cache.normalize_sql("SELECT *\n  FROM Users WHERE "
+                                      "name = 'A  B';"),
+            "select * from users where name = 'A  B'")
+
+    def test_key_includes_params(self):
+        """Same SQL with other parameters is another entry."""
+        self.assertNotEqual(QueryCache.make_key("SELECT 1 WHERE ?", [1]),
+                            QueryCache.make_key("SELECT 1 WHERE ?", [2]))
+        self.assertEqual(QueryCache.make_key("select 1", None),
+                         QueryCache.make_key("SELECT  1", ()))
+
+    @parameterized.expand([
+        ("SELECT * FROM users", {"users"}),
+        ("SELECT * FROM main.users u JOIN orders o ON o.uid = u.id",
+         {"users", "orders"}),
+        ("SELECT * FROM users AS u, orders o WHERE u.id = o.uid",
+         {"users", "orders"}),
+        ("SELECT 'from nowhere'", {ANY_TABLE}),
+    ])
+    def test_tables_read(self, sql, expected):
+        """FROM and JOIN sources are found, literals are ignored."""
+        self.assertEqual(query_cache.tables_read(sql), expected)
+
+    @parameterized.expand([
+        ("UPDATE users SET email = ?", {"users"}),
+        ("INSERT OR REPLACE INTO \"Users\" VALUES (1)", {"users"}),
+        ("DELETE FROM orders WHERE id = 'update x'", {"orders"}),
+        ("DROP TABLE IF EXISTS users", {"users"}),
+        ("WITH x AS (SELECT 1) DELETE FROM users", {ANY_TABLE}),
+        ("SELECT * FROM users", set()),
+        ("COMMIT", set()),
+    ])
+    def test_written_tables(self, sql, expected):
+        """Write statements name their target table."""
+        self.assertEqual(query_cache.written_tables(sql), expected)
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test suite for the QueryCache bounds, TTL and invalidation."""
+
+    def test_lru_by_entries(self):
+        """The least recently used entry is evicted first."""
+        cache = QueryCache(max_entries=2)
+        a, b, c = (QueryCache.make_key(f"SELECT {n} FROM t") for n in "abc")
+        cache.put(a, 1)
+        cache.put(b, 2)
+        cache.lookup(a)
+        cache.put(c, 3)
+        self.assertEqual(cache.lookup(b), (False, None))
+        self.assertEqual(cache.lookup(a), (True, 1))
+        self.assertEqual(cache.stats["evicted"], 1)
+
+    def test_bounded_by_bytes(self):
+        """The byte bound evicts old entries and skips oversized ones."""
+        row = [("x" * 1000,)]
+        cache = QueryCache(max_bytes=3000)
+        for n in range(5):
+            cache.put(QueryCache.make_key(f"SELECT {n}"), row)
+        self.assertLessEqual(cache.nbytes, 3000)
+        self.assertLess(len(cache), 5)
+        cache.put(QueryCache.make_key("SELECT big"), [("x" * 5000,)])
+        self.assertFalse(cache.lookup(QueryCache.make_key("SELECT big"))[0])
+
+    def test_ttl(self):
+        """Entries expire after their TTL, per entry or by default."""
+        clock = FakeClock()
+        cache = QueryCache(ttl=10, clock=clock)
+        short, long = QueryCache.make_key("SELECT 1"), ("SELECT 2", ())
+        cache.put(short, 1, ttl=1)
+        cache.put(long, 2)
+        clock.now = 5
+        self.assertEqual(cache.lookup(short), (False, None))
+        self.assertEqual(cache.lookup(long), (True, 2))
+        clock.now = 10
+        self.assertEqual(cache.lookup(long), (False, None))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate_tables(self):
+        """Only entries reading a written table (or unknown ones) go."""
+        cache = QueryCache()
+        users = QueryCache.make_key("SELECT * FROM users")
+        orders = QueryCache.make_key("SELECT * FROM orders")
+        unknown = QueryCache.make_key("SELECT 1")
+        for key in (users, orders, unknown):
+            cache.put(key, [])
+        self.assertEqual(query_cache.invalidate_tables(["USERS"]), 2)
+        self.assertEqual([cache.lookup(k)[0] for k in (users, orders)],
+                         [False, True])
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test suite for QueryCache.get_or_load miss coalescing."""
+
+    def setUp(self):
+        self.cache = QueryCache()
+        self.key = QueryCache.make_key("SELECT * FROM users")
+        self.release = threading.Event()
+        self.loads = 0
+
+    def slow_load(self):
+        self.loads += 1
+        self.release.wait(5)
+        return ["row"]
+
+    def wait_in_flight(self, count):
+        """Block until *count* callers have reached the cache."""
+        while (self.cache.stats["misses"]
+               + self.cache.stats["coalesced"]) < count:
+            threading.Event().wait(0.001)
+
+    def start_waiters(self, count, **kwargs):
+        """Start *count* callers and wait until all are in flight."""
+        results, threads = [], []
+        for _ in range(count):
+            thread = threading.Thread(target=lambda: results.append(
+                self.cache.get_or_load(self.key, self.slow_load, **kwargs)))
+            thread.start()
+            threads.append(thread)
+        self.wait_in_flight(count)
+        return results, threads
+
+    def test_concurrent_misses_load_once(self):
+        """One caller runs the query, the others share its result."""
+        results, threads = self.start_waiters(8)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(results, [["row"]] * 8)
+        self.assertEqual((self.cache.stats["misses"],
+                          self.cache.stats["coalesced"]), (1, 7))
+        self.cache.get_or_load(self.key, self.slow_load)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    def test_waiter_timeout(self):
+        """A waiter gives up after its timeout; the leader still caches."""
+        _, threads = self.start_waiters(1)
+        with self.assertRaises(TimeoutError):
+            self.cache.get_or_load(self.key, self.slow_load, timeout=0.01)
+        self.release.set()
+        threads[0].join()
+        self.assertEqual(self.cache.stats["timeouts"], 1)
+        self.assertEqual(self.cache.lookup(self.key), (True, ["row"]))
+
+    def test_errors_are_shared_not_cached(self):
+        """The leader's exception reaches the waiters; nothing is cached."""
+        def failing():
+            self.release.wait(5)
+            raise ValueError("bad query")
+
+        errors = []
+
+        def call():
+            try:
+                self.cache.get_or_load(self.key, failing)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.wait_in_flight(3)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidated_load_is_not_cached(self):
+        """A result read while its table was written is not kept."""
+        def load():
+            query_cache.invalidate_tables(["users"])
+            return ["stale"]
+
+        self.assertEqual(self.cache.get_or_load(self.key, load), ["stale"])
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestDecorators(unittest.TestCase):
+    """Test suite for cache_query and transactional together."""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE users (id INTEGER, email TEXT)")
+        self.conn.execute("INSERT INTO users VALUES (1, 'a@x')")
+        self.conn.commit()
+        self.cache = QueryCache()
+        self.calls = 0
+
+        @cache_module.cache_query(cache=self.cache)
+        def fetch(conn, query, params=()):
+            self.calls += 1
+            return conn.execute(query, params).fetchall()
+
+        @transactional
+        def set_email(conn, user_id, email):
+            conn.execute("UPDATE users SET email = ? WHERE id = ?",
+                         (email, user_id))
+
+        self.fetch, self.set_email = fetch, set_email
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_params_are_part_of_the_key(self):
+        """Each parameter set runs once; repeats come from the cache."""
+        sql = "SELECT email FROM users WHERE id = ?"
+        self.assertEqual(self.fetch(self.conn, sql, (1,)), [("a@x",)])
+        self.assertEqual(self.fetch(self.conn, sql, (2,)), [])
+        self.assertEqual(self.fetch(self.conn, query=sql, params=(1,)),
+                         [("a@x",)])
+        self.assertEqual(self.calls, 2)
+
+    def test_committed_write_invalidates(self):
+        """A transactional UPDATE drops cached reads of the table."""
+        sql = "SELECT email FROM users"
+        self.fetch(self.conn, sql)
+        self.set_email(self.conn, 1, "b@x")
+        self.assertEqual(self.fetch(self.conn, sql), [("b@x",)])
+        self.assertEqual(self.calls, 2)
+
+    def test_rolled_back_write_keeps_entries(self):
+        """A failed transaction invalidates nothing."""
+        sql = "SELECT email FROM users"
+        self.fetch(self.conn, sql)
+
+        @transactional
+        def failing(conn):
+            conn.execute("UPDATE users SET email = 'c@x'")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            failing(self.conn)
+        self.assertEqual(self.fetch(self.conn, sql), [("a@x",)])
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Unit tests for the retry engine and retry_on_failure."""
+
+import asyncio
+import importlib
+import sqlite3
+import unittest
+
+from parameterized import parameterized
+
+from retry import CircuitBreaker, CircuitOpenError, Retry, is_transient
+
+retry_on_failure = importlib.import_module(
+    "3-retry_on_failure").retry_on_failure
+
+LOCKED = sqlite3.OperationalError("database is locked")
+
+
+class FakeTime:
+    """Clock that only moves when sleep() is called."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Flaky:
+    """Raises the given errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestIsTransient(unittest.TestCase):
+    """Test suite for the default error classifier."""
+
+    @parameterized.expand([
+        (LOCKED, True),
+        (sqlite3.OperationalError("database table is locked: users"), True),
+        (sqlite3.OperationalError("database is busy"), True),
+        (sqlite3.OperationalError("no such table: users"), False),
+        (sqlite3.ProgrammingError("Cannot operate on a closed database."),
+         False),
+        (ValueError("locked"), False),
+    ])
+    def test_classification(self, exc, expected):
+        """Only lock contention is worth retrying."""
+        self.assertEqual(is_transient(exc), expected)
+
+
+class TestRetry(unittest.TestCase):
+    """Test suite for Retry backoff, budget and classification."""
+
+    def setUp(self):
+        self.time = FakeTime()
+
+    def policy(self, **options):
+        options.setdefault("rng", lambda: 1.0)
+        return Retry(sleep=self.time.sleep, clock=self.time.clock, **options)
+
+    def test_exponential_backoff_with_cap(self):
+        """Caps double from base_delay up to max_delay."""
+        func = Flaky(*[LOCKED] * 5)
+        self.assertEqual(self.policy(attempts=6, base_delay=1,
+                                     max_delay=5).call(func), "ok")
+        self.assertEqual(self.time.sleeps, [1, 2, 4, 5, 5])
+
+    def test_full_jitter(self):
+        """The wait is the jitter fraction of the cap."""
+        self.policy(base_delay=2, rng=lambda: 0.25).call(Flaky(LOCKED))
+        self.assertEqual(self.time.sleeps, [0.5])
+
+    def test_gives_up_after_attempts(self):
+        """The last transient error is raised once attempts run out."""
+        func = Flaky(*[LOCKED] * 3)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.policy(attempts=3).call(func)
+        self.assertEqual(func.calls, 3)
+
+    def test_elapsed_budget(self):
+        """No wait starts that would overrun max_elapsed."""
+        func = Flaky(*[LOCKED] * 10)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.policy(attempts=10, base_delay=1, max_elapsed=5).call(func)
+        self.assertEqual(self.time.sleeps, [1, 2])
+
+    def test_permanent_errors_are_not_retried(self):
+        """A programming error is raised on the first attempt."""
+        func = Flaky(sqlite3.OperationalError("no such table: users"))
+        with self.assertRaises(sqlite3.OperationalError):
+            self.policy().call(func)
+        self.assertEqual((func.calls, self.time.sleeps), (1, []))
+
+    def test_acall(self):
+        """Coroutines are retried too."""
+        func = Flaky(LOCKED)
+
+        async def coroutine():
+            return func()
+
+        policy = self.policy(base_delay=0)
+        self.assertEqual(asyncio.run(policy.acall(coroutine)), "ok")
+        self.assertEqual(func.calls, 2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test suite for CircuitBreaker."""
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10,
+                                      clock=self.time.clock)
+        self.retry = Retry(attempts=1, breaker=self.breaker,
+                           sleep=self.time.sleep, clock=self.time.clock)
+
+    def fail(self, times):
+        for _ in range(times):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.retry.call(Flaky(LOCKED))
+
+    def test_opens_then_fails_fast(self):
+        """After the threshold calls are refused without running."""
+        self.fail(3)
+        func = Flaky()
+        with self.assertRaises(CircuitOpenError):
+            self.retry.call(func)
+        self.assertEqual((func.calls, self.breaker.state), (0, "open"))
+
+    def test_half_open_trial(self):
+        """After reset_timeout one trial call decides the state."""
+        self.fail(3)
+        self.time.now = 10
+        self.assertEqual(self.breaker.state, "half-open")
+        self.fail(1)
+        self.assertEqual(self.breaker.state, "open")
+        self.time.now = 20
+        self.assertEqual(self.retry.call(Flaky()), "ok")
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_permanent_errors_do_not_open(self):
+        """Errors the database answered with count as healthy."""
+        self.fail(2)
+        with self.assertRaises(ValueError):
+            self.retry.call(Flaky(ValueError("bug")))
+        self.fail(2)
+        self.assertEqual(self.breaker.state, "closed")
+
+
+class TestRetryOnFailure(unittest.TestCase):
+    """Test suite for the retry_on_failure decorator."""
+
+    def test_retries_transient_errors(self):
+        """Locked database errors are retried; the result comes back."""
+        func = Flaky(LOCKED)
+        decorated = retry_on_failure(retries=3, delay=0)(lambda: func())
+        self.assertEqual(decorated(), "ok")
+        self.assertEqual(func.calls, 2)
+
+    def test_each_function_has_its_own_breaker(self):
+        """Breakers are per function unless one is shared explicitly."""
+        shared = CircuitBreaker()
+        first = retry_on_failure()(lambda: None)
+        second = retry_on_failure()(lambda: None)
+        third = retry_on_failure(breaker=shared)(lambda: None)
+        self.assertIsNot(first.retry_policy.breaker,
+                         second.retry_policy.breaker)
+        self.assertIs(third.retry_policy.breaker, shared)
+        self.assertIsNone(
+            retry_on_failure(breaker=None)(lambda: None).retry_policy.breaker)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,33 +3,61 @@
 stream_users – generator that yields users from user_data table, one by one.
 """
 
-import os
-import mysql.connector
 from mysql.connector import Error
 
+from seed import connect_to_prodev, user_columns
 
-def stream_users():
-    """Yields one user record at a time from the user_data table as a dictionary."""
+
+def _prefetched(cursor, prefetch):
+    """Yields the cursor's rows, fetching at most prefetch rows at a time."""
+    while True:
+        rows = cursor.fetchmany(prefetch)
+        if not rows:
+            return
+        yield from rows
+
+
+def stream_users(server_side=False, prefetch=1000, row_factory=None):
+    """Yields one user record at a time from the user_data table as a dictionary.
+
+    With ``server_side=True`` the rows are read through an unbuffered cursor
+    in chunks of at most ``prefetch`` rows, so client memory stays flat no
+    matter how large user_data grows.
+
+    With a ``row_factory`` (e.g. ``seed.UserRow._make``) rows are read as
+    plain tuples and passed through it instead of becoming dictionaries.
+    """
+    connection = None
+    cursor = None
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST", "localhost"),
-            port=int(os.getenv("MYSQL_PORT", 3306)),
-            user=os.getenv("MYSQL_USER", "root"),
-            password=os.getenv("MYSQL_PASSWORD", ""),
-            database="ALX_prodev"
-        )
+        connection = connect_to_prodev()
+        if connection is None:
+            return
+
+        cursor = connection.cursor(
+            dictionary=row_factory is None,
+            buffered=False if server_side else None)
+        cursor.execute(f"SELECT {user_columns(connection)} FROM user_data")
 
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT user_id, name, email, age FROM user_data")
+        if server_side:
+            rows = _prefetched(cursor, prefetch)
+        else:
+            rows = cursor
 
-        for row in cursor:
-            yield row
+        if row_factory is not None:
+            rows = map(row_factory, rows)
+        yield from rows
 
     except Error as e:
         print(f"[ERROR] Database error: {e}")
 
     finally:
         if cursor:
-            cursor.close()
+            try:
+                cursor.close()
+            except Error:
+                # Consumer stopped early: the pool discards a connection
+                # that still has part of an unbuffered result pending.
+                pass
         if connection:
             connection.close()
@@ -3,26 +3,54 @@
 1-batch_processing.py — Stream and process users in batches using generators.
 """
 
-import os
-import mysql.connector
 from mysql.connector import Error
 
+from columns import to_columns
+from seed import build_where, connect_to_prodev, user_columns
 
-def stream_users_in_batches(batch_size):
+
+def stream_users_in_batches(batch_size, row_factory=None, **criteria):
     """
     Generator that return batches (lists of dicts) from user_data table.
+
+    Optional ``column__lookup=value`` criteria (see seed.build_where) are
+    pushed down into the query, so only matching rows leave the server.
+    A ``row_factory`` (e.g. ``seed.UserRow._make``) replaces the dicts with
+    records built from the raw row tuples.
+    """
+    if row_factory is None:
+        yield from _fetch_batches(batch_size, True, criteria)
+        return
+    for batch in _fetch_batches(batch_size, False, criteria):
+        yield [row_factory(row) for row in batch]
+
+
+def stream_user_columns(batch_size, use_numpy=False, **criteria):
+    """
+    Generator that returns the same batches as columns.UserColumns objects,
+    built straight from raw row tuples (no per-row dict).
+    """
+    for batch in _fetch_batches(batch_size, False, criteria):
+        yield to_columns(batch, use_numpy)
+
+
+def _fetch_batches(batch_size, dictionary, criteria):
+    """
+    Run the user_data query and yield fetchmany() batches of dicts
+    (dictionary=True) or plain tuples.
     """
+    connection = None
+    cursor = None
     try:
-        connection = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST", "localhost"),
-            port=int(os.getenv("MYSQL_PORT", 3306)),
-            user=os.getenv("MYSQL_USER", "root"),
-            password=os.getenv("MYSQL_PASSWORD", ""),
-            database="ALX_prodev"
-        )
+        connection = connect_to_prodev()
+        if connection is None:
+            return
 
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT user_id, name, email, age FROM user_data")
+        where, params = build_where(connection, **criteria)
+        cursor = connection.cursor(dictionary=dictionary)
+        cursor.execute(
+            f"SELECT {user_columns(connection)} FROM user_data" + where,
+            params)
 
         while True:
             batch = cursor.fetchmany(batch_size)
@@ -34,18 +62,19 @@ def stream_users_in_batches(batch_size):
         print(f"[ERROR] {e}")
 
     finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'connection' in locals():
+        if cursor:
+            try:
+                cursor.close()
+            except Error:
+                pass  # consumer stopped early; the pool drops the connection
+        if connection:
             connection.close()
 
 
 def batch_processing(batch_size):
     """
     Generator that yields users older than 25, one by one, from batch streams.
+    The age filter runs in SQL, so non-matching rows are never transferred.
     """
-    for batch in stream_users_in_batches(batch_size):
-        for user in batch:
-            if user["age"] > 25:
-                print(user)
-                yield user
+    for batch in stream_users_in_batches(batch_size, age__gt=25):
+        yield from batch
@@ -1,23 +1,40 @@
 #!/usr/bin/env python3
 """
 2-lazy_paginate.py — Generator that lazily paginates user_data table
+
+Both generators hold a single connection for the whole walk; it is closed
+when the walk ends, or as soon as the generator is closed or collected.
+seed.connection_stats["checkouts"] shows how many connections a walk took.
+If no connection can be made, ConnectionError is raised.
 """
 
-from seed import connect_to_prodev
+from contextlib import closing
+
+from seed import connect_to_prodev, key_param, user_columns
+
+
+def _connect():
+    connection = connect_to_prodev()
+    if connection is None:
+        raise ConnectionError("Cannot connect to ALX_prodev")
+    return connection
 
 
-def paginate_users(page_size, offset):
+def paginate_users(page_size, offset, connection=None):
     """
     Fetch one page of users starting from given offset.
     Returns a list of dictionaries.
+    Uses connection when given (left open), else a throwaway one.
     """
-    connection = connect_to_prodev()
-    cursor = connection.cursor(dictionary=True)
-    cursor.execute(f"SELECT * FROM user_data LIMIT {page_size} OFFSET {offset}")
-    rows = cursor.fetchall()
-    cursor.close()
-    connection.close()
-    return rows
+    if connection is None:
+        with closing(_connect()) as connection:
+            return paginate_users(page_size, offset, connection)
+
+    with closing(connection.cursor(dictionary=True)) as cursor:
+        cursor.execute(
+            f"SELECT {user_columns(connection)} FROM user_data "
+            f"LIMIT {page_size} OFFSET {offset}")
+        return cursor.fetchall()
 
 
 def lazy_pagination(page_size):
@@ -26,10 +43,50 @@ def lazy_pagination(page_size):
     Each yield returns a list of users (page).
     Uses only one loop.
     """
-    offset = 0
-    while True:
-        page = paginate_users(page_size, offset)
-        if not page:
-            break
-        yield page
-        offset += page_size
+    with closing(_connect()) as connection:
+        offset = 0
+        while True:
+            page = paginate_users(page_size, offset, connection)
+            if not page:
+                break
+            yield page
+            offset += page_size
+
+
+def paginate_users_keyset(page_size, last_user_id=None, connection=None):
+    """
+    Fetch the page of users that follows last_user_id in primary-key order.
+    Seeking on the key keeps every page O(page_size), however deep the walk.
+    Returns a list of dictionaries.
+    """
+    if connection is None:
+        with closing(_connect()) as connection:
+            return paginate_users_keyset(page_size, last_user_id, connection)
+
+    select = f"SELECT {user_columns(connection)} FROM user_data "
+    with closing(connection.cursor(dictionary=True)) as cursor:
+        if last_user_id is None:
+            cursor.execute(
+                select + "ORDER BY user_data.user_id LIMIT %s", (page_size,))
+        else:
+            cursor.execute(
+                select + f"WHERE user_id > {key_param(connection)} "
+                "ORDER BY user_data.user_id LIMIT %s",
+                (last_user_id, page_size))
+        return cursor.fetchall()
+
+
+def lazy_keyset_pagination(page_size):
+    """
+    Same page-yielding interface as lazy_pagination, but walks user_data
+    with keyset (seek) pagination instead of LIMIT/OFFSET.
+    Uses only one loop.
+    """
+    with closing(_connect()) as connection:
+        last_user_id = None
+        while True:
+            page = paginate_users_keyset(page_size, last_user_id, connection)
+            if not page:
+                break
+            yield page
+            last_user_id = page[-1]["user_id"]
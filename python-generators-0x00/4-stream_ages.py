@@ -1,40 +1,169 @@
 #!/usr/bin/env python3
 """
 4-stream_ages.py — Compute average age using a generator (memory-efficient)
+
+aggregate_ages() runs AVG/COUNT/SUM/MIN/MAX inside MySQL when every
+requested statistic has an SQL equivalent, and otherwise folds
+stream_user_ages() through RunningAgeStats in a single pass. Either way
+count is an int and every other statistic a float (or None).
 """
 
-from seed import connect_to_prodev
+import math
+import random
+from contextlib import closing
+
+from mysql.connector import Error
+
+from seed import build_where, connect_to_prodev
+
+SQL_AGGREGATES = ("avg", "count", "sum", "min", "max")
+
+
+class RunningAgeStats:
+    """
+    One-pass statistics over a stream of ages.
+
+    Mean and variance use Welford's update; percentiles are approximated
+    from a fixed-size reservoir sample, so memory stays constant.
+    """
+
+    def __init__(self, reservoir_size=10_000, rng=None):
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._reservoir = []
+        self._reservoir_size = reservoir_size
+        self._rng = rng or random.Random()
+
+    def add(self, age):
+        """Fold one age into the running statistics."""
+        age = float(age)
+        self.count += 1
+        self.sum += age
+        if self.min is None or age < self.min:
+            self.min = age
+        if self.max is None or age > self.max:
+            self.max = age
+
+        delta = age - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (age - self._mean)
+
+        if len(self._reservoir) < self._reservoir_size:
+            self._reservoir.append(age)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self._reservoir_size:
+                self._reservoir[slot] = age
+
+    def add_many(self, ages):
+        """Fold every age of an iterable (e.g. a batch) into the statistics."""
+        for age in ages:
+            self.add(age)
 
+    @property
+    def avg(self):
+        return self._mean if self.count else None
 
-def stream_user_ages():
+    @property
+    def variance(self):
+        """Sample variance (None until two ages have been seen)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stdev(self):
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) from the reservoir sample."""
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100: {q}")
+        if not self._reservoir:
+            return None
+        ordered = sorted(self._reservoir)
+        rank = (len(ordered) - 1) * q / 100
+        low, high = math.floor(rank), math.ceil(rank)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    def get(self, name):
+        """Return a statistic by name: avg, count, sum, min, max,
+        variance, stdev or pNN (e.g. p50, p99)."""
+        if name.startswith("p") and name[1:].replace(".", "", 1).isdigit():
+            return self.percentile(float(name[1:]))
+        if name in SQL_AGGREGATES + ("variance", "stdev"):
+            return getattr(self, name)
+        raise ValueError(f"Unknown statistic: {name}")
+
+
+def stream_user_ages(**criteria):
     """
     Generator that yields one age at a time from the user_data table.
+    Optional criteria are pushed down as in seed.build_where.
     """
     connection = connect_to_prodev()
+    if connection is None:
+        raise ConnectionError("Cannot connect to ALX_prodev")
     cursor = connection.cursor()
-    cursor.execute("SELECT age FROM user_data")
+    try:
+        where, params = build_where(connection, **criteria)
+        cursor.execute("SELECT age FROM user_data" + where, params)
+
+        for row in cursor:  # ✅ 1st loop
+            yield row[0]     # age column
+    finally:
+        try:
+            cursor.close()
+        except Error:
+            pass  # closed early; the pool drops the unread result
+        connection.close()
+
 
-    for row in cursor:  # ✅ 1st loop
-        yield row[0]     # age column
+def aggregate_ages(*stats, in_sql=True, **criteria):
+    """
+    Return {stat: value} for the requested age statistics.
+
+    Defaults to avg, count, min and max. Pure SQL aggregates are computed
+    by MySQL in one query (unless in_sql=False); any other statistic
+    (variance, stdev, pNN) falls back to one streaming pass over
+    stream_user_ages(). MySQL's DECIMAL results are returned as floats,
+    like the streamed ones.
+    """
+    stats = stats or ("avg", "count", "min", "max")
+
+    if in_sql and all(name in SQL_AGGREGATES for name in stats):
+        columns = ", ".join(f"{name.upper()}(age)" for name in stats)
+        connection = connect_to_prodev()
+        if connection is None:
+            raise ConnectionError("Cannot connect to ALX_prodev")
+        with closing(connection), closing(connection.cursor()) as cursor:
+            where, params = build_where(connection, **criteria)
+            cursor.execute(f"SELECT {columns} FROM user_data" + where, params)
+            return {name: _as_number(name, value)
+                    for name, value in zip(stats, cursor.fetchone())}
 
-    cursor.close()
-    connection.close()
+    running = RunningAgeStats()
+    running.add_many(stream_user_ages(**criteria))
+    return {name: running.get(name) for name in stats}
+
+
+def _as_number(name, value):
+    if value is None:
+        return None
+    return int(value) if name == "count" else float(value)
 
 
 def compute_average_age():
     """
-    Uses the generator to compute and print average age of all users.
+    Computes the average age of all users in MySQL and prints it.
     """
-    total = 0
-    count = 0
-
-    for age in stream_user_ages():  # ✅ 2nd loop
-        total += age
-        count += 1
+    result = aggregate_ages("avg", "count")
 
-    if count > 0:
-        avg = total / count
-        print(f"Average age of users: {avg:.2f}")
+    if result["count"]:
+        print(f"Average age of users: {result['avg']:.2f}")
     else:
         print("No users found.")
 
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+async_streams.py – ``async for`` versions of the user_data generators.
+
+mysql-connector is blocking, so every stream drives the existing
+synchronous generator on its own worker thread (one thread per stream, so
+the pooled connection never changes threads) and hands batches to the
+event loop through a bounded asyncio.Queue. The worker reads up to
+*prefetch* batches ahead of the consumer and then waits, so a slow
+consumer applies backpressure instead of buffering the table.
+
+Functions
+---------
+astream_users()                     ➜ rows, like stream_users
+astream_users_in_batches(n)         ➜ batches, like stream_users_in_batches
+alazy_pagination(n)                 ➜ pages, like lazy_pagination
+astream_user_ages()                 ➜ ages, like stream_user_ages
+"""
+
+import asyncio
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, suppress
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List
+
+from prefetch import DONE, Failure
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Group a row-at-a-time generator into lists of *size*."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _offload(open_source: Callable[[], Iterator],
+                   prefetch: int = 1) -> AsyncIterator[Any]:
+    """
+    Yield the items of a blocking generator without blocking the loop.
+
+    ``open_source()`` is called to create the generator; it is advanced and
+    finally closed on a dedicated worker thread. At most *prefetch* items
+    wait in the queue while the next one is being fetched.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+    worker = ThreadPoolExecutor(max_workers=1,
+                                thread_name_prefix="user-stream")
+    source = open_source()
+
+    async def pump() -> None:
+        try:
+            while True:
+                item = await loop.run_in_executor(worker, next, source, DONE)
+                await queue.put(item)
+                if item is DONE:
+                    return
+        except Exception as exc:  # re-raised in the consumer
+            await queue.put(Failure(exc))
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is DONE:
+                return
+            if isinstance(item, Failure):
+                raise item.exc
+            yield item
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        # Runs after any in-flight fetch on the same thread, releasing the
+        # cursor and returning the connection to the pool.
+        await loop.run_in_executor(worker, source.close)
+        worker.shutdown(wait=False)
+
+
+async def astream_users_in_batches(batch_size: int, prefetch: int = 1,
+                                   **criteria: Any) -> AsyncIterator[List]:
+    """Async stream_users_in_batches; criteria as in seed.build_where."""
+    batches = importlib.import_module("1-batch_processing")
+    async with aclosing(_offload(
+            lambda: batches.stream_users_in_batches(batch_size, **criteria),
+            prefetch)) as stream:
+        async for batch in stream:
+            yield batch
+
+
+async def astream_users(batch_size: int = 1000,
+                        prefetch: int = 1) -> AsyncIterator[dict]:
+    """Async stream_users: rows one by one, fetched *batch_size* at a time."""
+    async with aclosing(
+            astream_users_in_batches(batch_size, prefetch)) as stream:
+        async for batch in stream:
+            for row in batch:
+                yield row
+
+
+async def alazy_pagination(page_size: int,
+                           prefetch: int = 1) -> AsyncIterator[List]:
+    """Async lazy_pagination: one page (list of dicts) per iteration."""
+    pages = importlib.import_module("2-lazy_paginate")
+    async with aclosing(_offload(lambda: pages.lazy_pagination(page_size),
+                                 prefetch)) as stream:
+        async for page in stream:
+            yield page
+
+
+async def astream_user_ages(batch_size: int = 1000, prefetch: int = 1,
+                            **criteria: Any) -> AsyncIterator[Any]:
+    """Async stream_user_ages: ages one by one, fetched in batches."""
+    ages = importlib.import_module("4-stream_ages")
+    async with aclosing(_offload(
+            lambda: _batched(ages.stream_user_ages(**criteria), batch_size),
+            prefetch)) as stream:
+        async for batch in stream:
+            for age in batch:
+                yield age
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+bench.py – Micro-benchmarks for the python-generators-0x00 helpers.
+
+Every benchmark seeds ALX_prodev.user_data through seed.py (synthetic rows,
+skipped when the table already holds enough) and prints one line per
+strategy. ``--backend sqlite`` runs against a throwaway SQLite stand-in
+(see sqlite_standin.py) instead of MySQL.
+
+``suite`` is the reproducible end-to-end run: for each table size it
+measures every generator strategy in a fresh process (throughput, peak
+RSS, time to first row, statements sent) and writes the results as JSON;
+``diff`` compares two such files, e.g. from two releases.
+
+Usage
+-----
+python3 bench.py suite --sizes 10k,1M,10M --output results.json
+python3 bench.py diff old.json new.json
+python3 bench.py memory --rows 200000
+python3 bench.py pagination --rows 200000 --page-size 100
+python3 bench.py connections --page-size 100
+python3 bench.py seed --rows 200000
+python3 bench.py rows --rows 200000
+python3 bench.py prefetch --page-size 1000 --work-ms 5
+python3 bench.py schema --rows 200000
+python3 bench.py fetch --rows 200000
+python3 bench.py sync --rows 200000
+"""
+
+import argparse
+import csv
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+import seed
+import sqlite_standin
+
+
+# ---------- Fixtures ---------- #
+def write_synthetic_csv(path: str, rows: int, start: int = 0) -> None:
+    """Write users number *start* to *start* + *rows* - 1 to *path*.
+
+    Every user is derived from its number alone, so a table seeded in
+    several steps holds exactly the rows of one seeded in a single step.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["user_id", "name", "email", "age"])
+        for i in range(start, start + rows):
+            digest = hashlib.blake2b(i.to_bytes(8, "big"),
+                                     digest_size=16).digest()
+            writer.writerow([
+                str(uuid.UUID(bytes=digest, version=4)),
+                f"User {i}",
+                f"user{i}@example.com",
+                18 + digest[0] % 82,
+            ])
+
+
+def seed_table(rows: int) -> int:
+    """Make sure user_data holds at least *rows* rows; return the count."""
+    server = seed.connect_db()
+    if server is None:
+        raise SystemExit("MySQL server unavailable")
+    seed.create_database(server)
+    server.close()
+
+    with closing(seed.connect_to_prodev()) as conn:
+        seed.create_table(conn)
+        with closing(conn.cursor()) as cur:
+            cur.execute("SELECT COUNT(*) FROM user_data")
+            (existing,) = cur.fetchone()
+        if existing >= rows:
+            return existing
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "user_data.csv")
+            write_synthetic_csv(path, rows - existing, start=existing)
+            seed.insert_data(conn, path)
+    return rows
+
+
+# ---------- Measurement ---------- #
+def measure(consume: Callable[[], Iterable]) -> Dict[str, float]:
+    """Drain *consume()* and report rows, wall time and peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = 0
+    for _ in consume():
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": count, "seconds": elapsed, "peak_mib": peak / 2 ** 20}
+
+
+def report(name: str, result: Dict[str, float]) -> None:
+    """Print one benchmark line."""
+    print(f"{name:<24} {result['rows']:>10} rows "
+          f"{result['seconds']:>8.3f} s {result['peak_mib']:>9.2f} MiB peak")
+
+
+# ---------- Benchmarks ---------- #
+def _buffered_users():
+    """Baseline: a fully buffered dictionary cursor."""
+    with closing(seed.connect_to_prodev()) as conn, \
+            closing(conn.cursor(dictionary=True, buffered=True)) as cur:
+        cur.execute(f"SELECT {seed.user_columns(conn)} FROM user_data")
+        yield from cur
+
+
+def bench_memory(args: argparse.Namespace) -> None:
+    """Peak client memory of buffered vs. server-side stream_users."""
+    stream_users = importlib.import_module("0-stream_users").stream_users
+    report("buffered cursor", measure(_buffered_users))
+    report("stream_users", measure(stream_users))
+    report("stream_users server-side",
+           measure(lambda: stream_users(server_side=True,
+                                        prefetch=args.prefetch)))
+
+
+def _key_at(offset: int):
+    """Return the user_id found *offset* rows into primary-key order."""
+    with closing(seed.connect_to_prodev()) as conn, \
+            closing(conn.cursor()) as cur:
+        cur.execute(f"SELECT {seed.key_column(conn)} FROM user_data "
+                    "ORDER BY user_data.user_id LIMIT 1 OFFSET %s", (offset,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _page_latency(fetch: Callable[[], list], repeat: int = 5) -> float:
+    """Best-of-*repeat* latency of one page fetch, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_pagination(args: argparse.Namespace) -> None:
+    """Per-page latency of LIMIT/OFFSET vs. keyset paging at growing depth."""
+    pager = importlib.import_module("2-lazy_paginate")
+    size = args.page_size
+    print(f"{'offset':>10} {'offset ms':>10} {'keyset ms':>10}")
+    for fraction in (0, 0.1, 0.25, 0.5, 0.75, 0.99):
+        offset = int(args.rows * fraction)
+        last = _key_at(offset - 1) if offset else None
+        by_offset = _page_latency(
+            lambda: pager.paginate_users(size, offset))
+        by_key = _page_latency(
+            lambda: pager.paginate_users_keyset(size, last))
+        print(f"{offset:>10} {by_offset:>10.2f} {by_key:>10.2f}")
+
+
+def bench_connections(args: argparse.Namespace) -> None:
+    """Connections used by one full walk of each paginating generator."""
+    pager = importlib.import_module("2-lazy_paginate")
+    for name in ("lazy_pagination", "lazy_keyset_pagination"):
+        walk = getattr(pager, name)
+        before = seed.connection_stats.copy()
+        start = time.perf_counter()
+        pages = sum(1 for _ in walk(args.page_size))
+        elapsed = time.perf_counter() - start
+        used = seed.connection_stats - before
+        print(f"{name:<24} {pages:>8} pages {elapsed:>8.3f} s "
+              f"{used['opened']:>6} opened {used['checkouts']:>6} checkouts")
+
+
+def bench_seed(args: argparse.Namespace) -> None:
+    """Batched INSERT IGNORE vs. LOAD DATA LOCAL INFILE for *rows* new rows."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            closing(seed.connect_to_prodev(allow_local_infile=True)) as conn:
+        for salt, (name, load) in enumerate((
+                ("batched inserts", seed.load_csv),
+                ("load data infile", seed.bulk_load_csv)), start=1):
+            path = os.path.join(tmp, f"{salt}.csv")
+            # Numbered far past anything seed_table writes: all new rows.
+            write_synthetic_csv(path, args.rows, start=salt << 40)
+            start = time.perf_counter()
+            inserted = load(conn, path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {inserted:>10} rows {elapsed:>8.3f} s "
+                  f"{inserted / elapsed:>12,.0f} rows/s")
+
+
+def bench_rows(args: argparse.Namespace) -> None:
+    """Per-row allocation and throughput of dict rows vs. UserRow records."""
+    stream_users = importlib.import_module("0-stream_users").stream_users
+    for name, factory in (("dict cursor", None),
+                          ("tuple", tuple),
+                          ("UserRow", seed.UserRow._make)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = list(stream_users(server_side=True, prefetch=args.prefetch,
+                                 row_factory=factory))
+        elapsed = time.perf_counter() - start
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_row = held / len(rows) if rows else 0
+        print(f"{name:<24} {len(rows):>10} rows {elapsed:>8.3f} s "
+              f"{len(rows) / elapsed:>12,.0f} rows/s {per_row:>8.0f} B/row")
+        del rows
+
+
+def bench_prefetch(args: argparse.Namespace) -> None:
+    """Walk time with a busy consumer, with and without read-ahead."""
+    from prefetch import read_ahead
+
+    pager = importlib.import_module("2-lazy_paginate")
+    batches = importlib.import_module("1-batch_processing")
+    sources = (
+        ("lazy_pagination", lambda: pager.lazy_pagination(args.page_size)),
+        ("stream_users_in_batches",
+         lambda: batches.stream_users_in_batches(args.page_size)),
+    )
+    for name, source in sources:
+        for depth in (0, 1, 2):
+            pages = source() if not depth else read_ahead(source(), depth)
+            start = time.perf_counter()
+            for _ in pages:
+                time.sleep(args.work_ms / 1000)  # stand-in for consumer CPU
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} depth={depth} {elapsed:>8.3f} s")
+
+
+def bench_sync(args: argparse.Namespace) -> None:
+    """Re-sync the seeded rows from a CSV in which 1% of the names changed."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            closing(seed.connect_to_prodev()) as conn:
+        path = os.path.join(tmp, "users.csv")
+        write_synthetic_csv(path, args.rows)
+        changed = os.path.join(tmp, "changed.csv")
+        with open(path, newline="", encoding="utf-8") as src, \
+                open(changed, "w", newline="", encoding="utf-8") as dst:
+            writer = csv.writer(dst)
+            for i, row in enumerate(csv.reader(src)):
+                if i and i % 100 == 0:
+                    row[1] += " (renamed)"
+                writer.writerow(row)
+
+        for name, csv_path in (("sync unchanged", path),
+                               ("sync 1% changed", changed)):
+            start = time.perf_counter()
+            result = seed.sync_csv(conn, csv_path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {elapsed:>8.3f} s {result.inserted:>8} new "
+                  f"{result.updated:>8} updated "
+                  f"{result.unchanged:>10} unchanged")
+
+
+def bench_fetch(args: argparse.Namespace) -> None:
+    """stream_user_data throughput with fixed vs. adaptive fetch sizes."""
+    for batch_size in (1, 100, 1000, 10_000, None):
+        sizing = seed.AdaptiveFetchSize() if batch_size is None else batch_size
+        with closing(seed.connect_to_prodev()) as conn:
+            start = time.perf_counter()
+            rows = sum(1 for _ in seed.stream_user_data(conn, sizing))
+            elapsed = time.perf_counter() - start
+        name = f"fetchmany({batch_size})" if batch_size else "adaptive"
+        print(f"{name:<24} {rows:>10} rows {elapsed:>8.3f} s "
+              f"{rows / elapsed:>12,.0f} rows/s")
+        if batch_size is None:
+            tried = ", ".join(f"{size}: {per_row * 1e6:.2f} us/row"
+                              for size, per_row in sizing.history)
+            print(f"{'':<24} settled on {sizing.size} ({tried})")
+
+
+# The user_data schema before the key/index tuning: CHAR(36) key,
+# a second index on the key column and no index serving age queries.
+_LEGACY_DDL = """
+CREATE TABLE {table} (
+    user_id    CHAR(36) PRIMARY KEY,
+    name       VARCHAR(255) NOT NULL,
+    email      VARCHAR(255) NOT NULL,
+    age        DECIMAL(4,0) NOT NULL,
+    updated_at DATETIME(6) NOT NULL
+               DEFAULT CURRENT_TIMESTAMP(6)
+               ON UPDATE CURRENT_TIMESTAMP(6),
+    INDEX (user_id),
+    INDEX idx_updated_at (updated_at, user_id)
+) ENGINE=InnoDB
+"""
+
+
+def _timed(cur, sql: str, params: tuple = ()) -> float:
+    """Run *sql*, drain its result and return the elapsed seconds."""
+    start = time.perf_counter()
+    cur.execute(sql, params)
+    for _ in cur:
+        pass
+    return time.perf_counter() - start
+
+
+def bench_schema(args: argparse.Namespace) -> None:
+    """Insert rate, scan times and size: CHAR(36) key vs. BINARY(16) key."""
+    rng = random.Random(args.rows)
+    variants = (
+        ("before: CHAR(36), v4", None,
+         lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))),
+        ("after: BINARY(16), v4", True,
+         lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))),
+        ("after: BINARY(16), v1", True, seed.new_user_id),
+    )
+    print(f"{'schema':<24} {'insert rows/s':>14} {'pk scan s':>10} "
+          f"{'age>25 s':>9} {'avg(age) s':>11} {'MiB':>8}")
+    with closing(seed.connect_to_prodev()) as conn, \
+            closing(conn.cursor()) as cur:
+        for name, binary, new_id in variants:
+            table = "bench_user_data"
+            cur.execute(f"DROP TABLE IF EXISTS {table}")
+            if binary:
+                cur.execute(seed.user_data_ddl(table, binary_key=True))
+                key, mark = "BIN_TO_UUID(user_id, 1)", "UUID_TO_BIN(%s, 1)"
+            else:
+                cur.execute(_LEGACY_DDL.format(table=table))
+                key, mark = "user_id", "%s"
+
+            start = time.perf_counter()
+            for low in range(0, args.rows, 1000):
+                chunk = [(new_id(), f"User {i}", f"user{i}@example.com",
+                          rng.randint(18, 99))
+                         for i in range(low, min(low + 1000, args.rows))]
+                cur.execute(
+                    f"INSERT INTO {table} (user_id, name, email, age) VALUES "
+                    + ", ".join([f"({mark}, %s, %s, %s)"] * len(chunk)),
+                    [field for row in chunk for field in row])
+            insert_rate = args.rows / (time.perf_counter() - start)
+
+            scan = _timed(cur, f"SELECT {key}, name, email, age FROM {table} "
+                               f"ORDER BY {table}.user_id")
+            by_age = _timed(cur, f"SELECT {key}, name, email, age "
+                                 f"FROM {table} WHERE age > %s", (25,))
+            average = _timed(cur, f"SELECT AVG(age) FROM {table}")
+
+            cur.execute(f"ANALYZE TABLE {table}")
+            cur.fetchall()
+            cur.execute("SELECT DATA_LENGTH + INDEX_LENGTH "
+                        "FROM information_schema.TABLES "
+                        "WHERE TABLE_SCHEMA = DATABASE() "
+                        "AND TABLE_NAME = %s", (table,))
+            (size,) = cur.fetchone()
+            print(f"{name:<24} {insert_rate:>14,.0f} {scan:>10.3f} "
+                  f"{by_age:>9.3f} {average:>11.3f} {size / 2 ** 20:>8.1f}")
+        cur.execute("DROP TABLE IF EXISTS bench_user_data")
+
+
+# ---------- Suite ---------- #
+def _module(name: str):
+    return importlib.import_module(name)
+
+
+def _counted(source: Iterable, batched: bool = False) -> Iterator[int]:
+    """Yield the row count of each item of *source*, closing it at the end."""
+    try:
+        for item in source:
+            yield len(item) if batched else 1
+    finally:
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+
+
+def _aggregate(in_sql: bool) -> Iterator[int]:
+    """compute_average_age's query (no printing); yields the rows covered."""
+    stats = _module("4-stream_ages").aggregate_ages(
+        "avg", "count", in_sql=in_sql)
+    yield stats["count"]
+
+
+SUITE: Dict[str, Callable[[argparse.Namespace], Iterator[int]]] = {
+    "stream_users": lambda args: _counted(
+        _module("0-stream_users").stream_users()),
+    "stream_users server-side": lambda args: _counted(
+        _module("0-stream_users").stream_users(server_side=True,
+                                               prefetch=args.prefetch)),
+    "stream_users_in_batches": lambda args: _counted(
+        _module("1-batch_processing").stream_users_in_batches(
+            args.page_size), batched=True),
+    "lazy_pagination": lambda args: _counted(
+        _module("2-lazy_paginate").lazy_pagination(args.page_size),
+        batched=True),
+    "lazy_keyset_pagination": lambda args: _counted(
+        _module("2-lazy_paginate").lazy_keyset_pagination(args.page_size),
+        batched=True),
+    "compute_average_age sql": lambda args: _aggregate(in_sql=True),
+    "compute_average_age streamed": lambda args: _aggregate(in_sql=False),
+}
+
+
+def _peak_rss_mib() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** (20 if sys.platform == "darwin" else 10)
+
+
+def _questions() -> int:
+    """The server's count of statements executed (both backends)."""
+    with closing(seed.connect_to_prodev()) as conn, \
+            closing(conn.cursor()) as cur:
+        cur.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        return int(cur.fetchone()[1])
+
+
+def _measure(strategy: str, options: Dict[str, Any],
+             standin: str | None) -> Dict[str, Any]:
+    """Run one SUITE strategy to completion (or the time budget).
+
+    Executed in a fresh process, so peak RSS belongs to this run alone.
+    """
+    if standin is not None:
+        sqlite_standin.install(standin)
+    args = argparse.Namespace(**options)
+    before = _questions()
+    baseline = _peak_rss_mib()
+    checkouts = seed.connection_stats["checkouts"]
+
+    rows, first_row, complete = 0, None, True
+    start = time.perf_counter()
+    counts = SUITE[strategy](args)
+    for count in counts:
+        if first_row is None:
+            first_row = time.perf_counter() - start
+        rows += count
+        if time.perf_counter() - start > args.budget:
+            complete = False
+            break
+    counts.close()
+    elapsed = time.perf_counter() - start
+    connections = seed.connection_stats["checkouts"] - checkouts
+
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+        "ttfr_ms": None if first_row is None else round(first_row * 1000, 3),
+        "peak_rss_mib": round(_peak_rss_mib(), 1),
+        "rss_growth_mib": round(_peak_rss_mib() - baseline, 1),
+        # Every _questions() call counts itself once.
+        "round_trips": _questions() - before - 1,
+        "connections": connections,
+        "complete": complete,
+    }
+
+
+def _parse_sizes(text: str) -> list:
+    """``"10k,1M,10M"`` ➜ ``[10000, 1000000, 10000000]``."""
+    scale = {"k": 10 ** 3, "m": 10 ** 6}
+    sizes = []
+    for item in text.split(","):
+        item = item.strip().lower()
+        factor = scale.get(item[-1:], 1)
+        sizes.append(int(float(item.rstrip("km")) * factor))
+    return sorted(sizes)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True,
+            text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(args: argparse.Namespace) -> None:
+    """Every SUITE strategy at every --sizes, written to --output as JSON."""
+    options = {"prefetch": args.prefetch, "page_size": args.page_size,
+               "budget": args.budget}
+    spawn = multiprocessing.get_context("spawn")
+    results = []
+    print(f"{'table rows':>10} {'strategy':<30} {'rows/s':>12} "
+          f"{'ttfr ms':>9} {'peak MiB':>9} {'trips':>7}")
+    for size in _parse_sizes(args.sizes):
+        table_rows = seed_table(size)
+        for strategy in SUITE:
+            runs = []
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(1, mp_context=spawn) as worker:
+                    runs.append(worker.submit(
+                        _measure, strategy, options, args.standin).result())
+            best = min(runs, key=lambda run: run["seconds"])
+            results.append({"table_rows": table_rows, "strategy": strategy,
+                            **best})
+            print(f"{table_rows:>10} {strategy:<30} "
+                  f"{best['rows_per_sec'] or 0:>12,.0f} "
+                  f"{best['ttfr_ms'] or 0:>9.1f} {best['peak_rss_mib']:>9.1f} "
+                  f"{best['round_trips']:>7}"
+                  + ("" if best["complete"] else "  (budget hit)"))
+
+    document = {
+        "format": 1,
+        "backend": "mysql" if args.standin is None else "sqlite",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {**options, "repeat": args.repeat},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(document, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    print(f"results written to {args.output}")
+
+
+def bench_diff(args: argparse.Namespace) -> None:
+    """Relative change of each metric between two suite result files."""
+    if len(args.files) != 2:
+        raise SystemExit("diff takes exactly two result files")
+    loaded = []
+    for path in args.files:
+        with open(path, encoding="utf-8") as fh:
+            loaded.append(json.load(fh)["results"])
+    old, new = loaded
+    metrics = ("rows_per_sec", "ttfr_ms", "peak_rss_mib", "round_trips")
+    baseline = {(r["table_rows"], r["strategy"]): r for r in old}
+    print(f"{'table rows':>10} {'strategy':<30}"
+          + "".join(f" {metric:>13}" for metric in metrics))
+    for result in new:
+        before = baseline.get((result["table_rows"], result["strategy"]))
+        if before is None:
+            continue
+        changes = []
+        for metric in metrics:
+            was, now = before.get(metric), result.get(metric)
+            if was and now is not None:
+                changes.append(f"{(now - was) / was:>+13.1%}")
+            else:
+                changes.append(f"{'n/a':>13}")
+        print(f"{result['table_rows']:>10} {result['strategy']:<30} "
+              + " ".join(changes))
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "pagination": bench_pagination,
+    "connections": bench_connections,
+    "seed": bench_seed,
+    "rows": bench_rows,
+    "prefetch": bench_prefetch,
+    "schema": bench_schema,
+    "fetch": bench_fetch,
+    "sync": bench_sync,
+    "suite": bench_suite,
+    "diff": bench_diff,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--rows", type=int, default=100_000,
+                        help="minimum number of rows in user_data")
+    parser.add_argument("--prefetch", type=int, default=1000,
+                        help="server-side cursor prefetch size")
+    parser.add_argument("--page-size", type=int, default=100,
+                        help="rows per page for pagination benchmarks")
+    parser.add_argument("--work-ms", type=float, default=5.0,
+                        help="simulated consumer work per batch (prefetch)")
+    parser.add_argument("--backend", choices=("auto", "mysql", "sqlite"),
+                        default="auto",
+                        help="sqlite: throwaway stand-in database; "
+                             "auto: sqlite only if MySQL is unreachable")
+    parser.add_argument("--sizes", default="10k,1M,10M",
+                        help="table sizes for suite, e.g. 10k,1M,10M")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="suite runs per strategy (the fastest is kept)")
+    parser.add_argument("--budget", type=float, default=120.0,
+                        help="seconds after which a suite run is cut short")
+    parser.add_argument("--output", default="bench-results.json",
+                        help="where suite writes its JSON results")
+    parser.add_argument("files", nargs="*", help="the two files for diff")
+    args = parser.parse_args()
+
+    if args.benchmark == "diff":
+        bench_diff(args)
+        return
+
+    args.standin = None
+    use_standin = args.backend == "sqlite"
+    if args.backend == "auto":
+        server = seed.connect_db()
+        if server is not None:
+            server.close()
+        else:
+            print("[WARN] MySQL unreachable; using the SQLite stand-in",
+                  file=sys.stderr)
+            use_standin = True
+    if use_standin:
+        tmp = tempfile.mkdtemp(prefix="bench-")
+        args.standin = os.path.join(tmp, "ALX_prodev.sqlite")
+        sqlite_standin.install(args.standin)
+    try:
+        if args.benchmark != "suite":
+            seed_table(args.rows)
+        BENCHMARKS[args.benchmark](args)
+    finally:
+        if args.standin is not None:
+            shutil.rmtree(os.path.dirname(args.standin), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+columns.py – Compact, column-oriented batches of user_data rows.
+
+A batch of N users is stored as four columns instead of N dicts: ages in
+one ``array('h')`` and each string column as a single ``str`` plus an
+``array('L')`` of end offsets. When NumPy is installed the age column can
+be exposed as a zero-copy ``int16`` ndarray. DECIMAL(4,0) ages span
+-9999..9999, so a signed 16-bit column holds any value the table can.
+
+Functions
+---------
+to_columns(rows)             ➜ UserColumns built from raw row tuples
+"""
+
+from array import array
+from decimal import Decimal
+from typing import Iterable, Iterator, Sequence, Tuple, overload
+
+try:
+    import numpy
+except ImportError:  # optional dependency
+    numpy = None
+
+
+class StringColumn(Sequence[str]):
+    """Immutable sequence of strings stored as one buffer plus end offsets."""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self, values: Iterable[str]) -> None:
+        values = list(values)
+        self._data = "".join(values)
+        self._ends = array("L")
+        end = 0
+        for value in values:
+            end += len(value)
+            self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringColumn index out of range")
+        start = self._ends[index - 1] if index else 0
+        return self._data[start:self._ends[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        start = 0
+        for end in self._ends:
+            yield self._data[start:end]
+            start = end
+
+
+class UserColumns:
+    """One batch of users as columns (user_id, name, email, age)."""
+
+    __slots__ = ("user_id", "name", "email", "age")
+
+    def __init__(self, user_id: StringColumn, name: StringColumn,
+                 email: StringColumn, age) -> None:
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        self.age = age
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    def rows(self) -> Iterator[Tuple[str, str, str, Decimal]]:
+        """Re-materialise the batch as (user_id, name, email, age) tuples.
+
+        Ages come back as Decimal, as in the rows the cursor returned.
+        """
+        return zip(self.user_id, self.name, self.email,
+                   (Decimal(int(age)) for age in self.age))
+
+
+def to_columns(rows: Sequence[tuple], use_numpy: bool = False) -> UserColumns:
+    """
+    Build a UserColumns batch from raw (user_id, name, email, age) tuples.
+
+    With ``use_numpy=True`` (and NumPy installed) ``age`` is an ``int16``
+    ndarray sharing the array's buffer; otherwise it is an ``array('h')``.
+    """
+    ages = array("h", (int(row[3]) for row in rows))
+    if use_numpy and numpy is not None:
+        ages = numpy.frombuffer(ages, dtype=numpy.int16)
+    return UserColumns(
+        StringColumn(row[0] for row in rows),
+        StringColumn(row[1] for row in rows),
+        StringColumn(row[2] for row in rows),
+        ages,
+    )
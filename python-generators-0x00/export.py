@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+export.py – Stream user_data into NDJSON, Parquet or Arrow IPC files.
+
+Rows are read in fetchmany() batches of plain tuples (the query of
+stream_users_in_batches, except that database errors abort the export
+instead of ending it early) and written one whole batch at a time: an
+Arrow record batch (columns converted in C by pyarrow) or one joined
+block of NDJSON lines. Memory is bounded by one batch per writer
+whatever the table size.
+
+With ``partitions=N`` the key space is cut as in parallel_scan and each
+range is written to its own file by its own thread and connection. The
+writers overlap their database reads and compression (zlib, zstd...
+release the GIL), so throughput scales until the disk or the server is
+the limit.
+
+Files are written under a ``.tmp`` name and renamed into place once
+complete, so readers never see a partial export.
+
+pyarrow is optional; it is needed only for the parquet and arrow formats.
+
+Usage
+-----
+python3 export.py users.ndjson.gz --compression gzip
+python3 export.py users/ --format parquet --partitions 4 --compression zstd
+
+Functions
+---------
+export_users(dest, fmt, ...)     ➜ ExportResult(rows, files)
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple
+
+from parallel_scan import cap_partitions, partition_bounds
+from seed import build_where, connect_to_prodev, user_columns
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+FORMATS = ("ndjson", "parquet", "arrow")
+
+# NDJSON compression ➜ (opener, file suffix)
+_NDJSON_CODECS: Dict[str | None, tuple] = {
+    None:   (open, ""),
+    "gzip": (lambda path, mode: gzip.open(path, mode, compresslevel=6),
+             ".gz"),
+    "bz2":  (bz2.open, ".bz2"),
+    "xz":   (lzma.open, ".xz"),
+}
+
+_SUFFIXES = {"ndjson": ".ndjson", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+class ExportResult(NamedTuple):
+    """Rows written and the files holding them."""
+    rows:  int
+    files: List[str]
+
+
+def _schema():
+    # DECIMAL(4,0) holds no fraction: ages travel as int16.
+    return pyarrow.schema([("user_id", pyarrow.string()),
+                           ("name", pyarrow.string()),
+                           ("email", pyarrow.string()),
+                           ("age", pyarrow.int16())])
+
+
+def _record_batch(batch: List[tuple], schema):
+    """One list of row tuples ➜ one Arrow record batch."""
+    user_id, name, email, age = zip(*batch)
+    return pyarrow.RecordBatch.from_arrays([
+        pyarrow.array(user_id, pyarrow.string()),
+        pyarrow.array(name, pyarrow.string()),
+        pyarrow.array(email, pyarrow.string()),
+        pyarrow.array(age).cast(pyarrow.int16()),
+    ], schema=schema)
+
+
+def _fetch_batches(batch_size: int,
+                   criteria: Dict[str, Any]) -> Iterator[List[tuple]]:
+    """Yield fetchmany() batches of row tuples matching *criteria*."""
+    connection = connect_to_prodev()
+    if connection is None:
+        raise ConnectionError("Cannot connect to ALX_prodev")
+    with closing(connection):
+        where, params = build_where(connection, **criteria)
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {user_columns(connection)} FROM user_data"
+                       + where, params)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield batch
+
+
+def _write_ndjson(path: str, batches: Iterable[List[tuple]],
+                  compression: str | None, stop: threading.Event) -> int:
+    opener, _ = _NDJSON_CODECS[compression]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    rows = 0
+    with opener(path, "wb") as fh:
+        for batch in batches:
+            if stop.is_set():
+                break
+            lines = [encode({"user_id": user_id, "name": name,
+                             "email": email, "age": int(age)})
+                     for user_id, name, email, age in batch]
+            lines.append("")
+            fh.write("\n".join(lines).encode("utf-8"))
+            rows += len(batch)
+    return rows
+
+
+def _write_parquet(path: str, batches: Iterable[List[tuple]],
+                   compression: str | None, stop: threading.Event) -> int:
+    schema = _schema()
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(
+            path, schema, compression=compression or "none") as writer:
+        for batch in batches:
+            if stop.is_set():
+                break
+            # One row group per batch: keep batch_size in the 10^4..10^6
+            # range so row groups stay reasonably large.
+            writer.write_table(pyarrow.Table.from_batches(
+                [_record_batch(batch, schema)]))
+            rows += len(batch)
+    return rows
+
+
+def _write_arrow(path: str, batches: Iterable[List[tuple]],
+                 compression: str | None, stop: threading.Event) -> int:
+    schema = _schema()
+    options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+    rows = 0
+    with pyarrow.OSFile(path, "wb") as sink, \
+            pyarrow.ipc.new_file(sink, schema, options=options) as writer:
+        for batch in batches:
+            if stop.is_set():
+                break
+            writer.write_batch(_record_batch(batch, schema))
+            rows += len(batch)
+    return rows
+
+
+_WRITERS: Dict[str, Callable[..., int]] = {
+    "ndjson":  _write_ndjson,
+    "parquet": _write_parquet,
+    "arrow":   _write_arrow,
+}
+
+
+def _export_range(path: str, fmt: str, batch_size: int,
+                  compression: str | None, criteria: Dict[str, Any],
+                  stop: threading.Event) -> int:
+    """Worker: write the rows matching *criteria* to *path* atomically."""
+    batches = _fetch_batches(batch_size, criteria)
+    tmp = f"{path}.tmp"
+    try:
+        with closing(batches):
+            rows = _WRITERS[fmt](tmp, batches, compression, stop)
+        if stop.is_set():
+            raise InterruptedError("export cancelled")
+        os.replace(tmp, path)
+    except BaseException:
+        stop.set()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return rows
+
+
+def export_users(destination: str, fmt: str = "ndjson",
+                 batch_size: int = 50_000, compression: str | None = None,
+                 partitions: int = 1, **criteria: Any) -> ExportResult:
+    """
+    Export user_data (optionally filtered) to *destination*.
+
+    Parameters
+    ----------
+    destination : str
+        Output file; with ``partitions > 1`` a directory that receives
+        ``part-00000.<ext>``, ``part-00001.<ext>``, ...
+    fmt : str
+        ``"ndjson"``, ``"parquet"`` or ``"arrow"`` (IPC file format).
+    batch_size : int
+        Rows fetched and written per step; bounds memory per writer.
+    compression : str, optional
+        ndjson: gzip, bz2 or xz. parquet: any pyarrow codec (snappy,
+        zstd, gzip, ...). arrow: lz4 or zstd.
+    partitions : int
+        Key ranges exported in parallel, one file, thread and connection
+        each (at most the pool size).
+    criteria
+        Optional filters, pushed down as in seed.build_where.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt != "ndjson" and pyarrow is None:
+        raise ImportError(f"pyarrow is required for {fmt} export")
+    if fmt == "ndjson" and compression not in _NDJSON_CODECS:
+        raise ValueError(f"Unsupported ndjson compression: {compression}")
+    if {"user_id__gte", "user_id__lt"} & criteria.keys() and partitions > 1:
+        raise ValueError("user_id range criteria cannot be combined with "
+                         "partitions")
+
+    if partitions <= 1:
+        jobs = [(destination, criteria)]
+    else:
+        connection = connect_to_prodev()
+        if connection is None:
+            raise ConnectionError("Cannot connect to ALX_prodev")
+        with closing(connection):
+            bounds = partition_bounds(connection,
+                                      cap_partitions(partitions))
+        os.makedirs(destination, exist_ok=True)
+        suffix = _SUFFIXES[fmt]
+        if fmt == "ndjson":
+            suffix += _NDJSON_CODECS[compression][1]
+        jobs = []
+        for i, (lower, upper) in enumerate(bounds):
+            ranged = dict(criteria)
+            if lower is not None:
+                ranged["user_id__gte"] = lower
+            if upper is not None:
+                ranged["user_id__lt"] = upper
+            jobs.append((os.path.join(destination, f"part-{i:05d}{suffix}"),
+                         ranged))
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(jobs),
+                            thread_name_prefix="user-export") as pool:
+        futures = [pool.submit(_export_range, path, fmt, batch_size,
+                               compression, ranged, stop)
+                   for path, ranged in jobs]
+    # Report the failure that stopped the export, not a cancelled sibling.
+    failures = [future.exception() for future in futures]
+    for exc in failures:
+        if exc is not None and not isinstance(exc, InterruptedError):
+            raise exc
+    return ExportResult(sum(future.result() for future in futures),
+                        [path for path, _ in jobs])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("destination")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--compression", default=None)
+    parser.add_argument("--partitions", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    result = export_users(args.destination, args.format, args.batch_size,
+                          args.compression, args.partitions)
+    print(f"{result.rows} rows exported to {len(result.files)} file(s)")
+
+
+if __name__ == "__main__":
+    main()
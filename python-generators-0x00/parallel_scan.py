@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+parallel_scan.py – Range-partitioned, multi-threaded scan of user_data.
+
+The user_id key space is cut into N contiguous ranges of roughly equal row
+count; each range is read on its own thread and connection, and the
+batches are merged back into a single generator. N is capped at the size
+of the connection pool, so no worker waits for a connection held by
+another.
+
+Functions
+---------
+partition_bounds(conn, n)            ➜ [(lower, upper), ...] key ranges
+cap_partitions(n)                    ➜ n, at most the pool size
+parallel_scan_batches(n, ...)        ➜ **generator** of row batches
+parallel_scan(n, ...)                ➜ **generator** of single rows
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mysql.connector.connection import MySQLConnection
+
+from prefetch import DONE, Failure, put_or_stop
+from seed import (build_where, connect_to_prodev, get_pool, key_column,
+                  user_columns)
+
+Bound = Tuple[Optional[str], Optional[str]]
+
+def partition_bounds(connection: MySQLConnection,
+                     partitions: int) -> List[Bound]:
+    """
+    Split user_id into *partitions* half-open ranges ``[lower, upper)``.
+
+    Boundaries are read off the primary-key index at evenly spaced offsets,
+    so ranges hold similar row counts whatever the key distribution.
+    ``None`` marks an open end.
+    """
+    with closing(connection.cursor()) as cur:
+        cur.execute("SELECT COUNT(*) FROM user_data")
+        (total,) = cur.fetchone()
+
+        cuts = []
+        for i in range(1, max(1, min(partitions, total))):
+            cur.execute(f"SELECT {key_column(connection)} FROM user_data "
+                        "ORDER BY user_data.user_id LIMIT 1 OFFSET %s",
+                        (i * total // partitions,))
+            (key,) = cur.fetchone()
+            # Textual ids of a BINARY(16) key do not sort like the key, so
+            # only drop repeats; the offsets already come in key order.
+            if not cuts or key != cuts[-1]:
+                cuts.append(key)
+
+    edges = [None, *cuts, None]
+    return list(zip(edges, edges[1:]))
+
+
+def cap_partitions(partitions: int) -> int:
+    """*partitions*, limited to the connections the ALX_prodev pool allows."""
+    return max(1, min(partitions, get_pool("ALX_prodev").max_size))
+
+
+def _scan_range(bound: Bound, batch_size: int, criteria: Dict[str, Any],
+                out: queue.Queue, stop: threading.Event) -> None:
+    """Worker: stream one key range into *out*, then a DONE marker."""
+    lower, upper = bound
+    if lower is not None:
+        criteria = {**criteria, "user_id__gte": lower}
+    if upper is not None:
+        criteria = {**criteria, "user_id__lt": upper}
+    try:
+        if stop.is_set():
+            return
+        connection = connect_to_prodev()
+        if connection is None:
+            raise ConnectionError("Cannot connect to ALX_prodev")
+        with closing(connection):
+            where, params = build_where(connection, **criteria)
+            cur = connection.cursor(dictionary=True)
+            cur.execute(f"SELECT {user_columns(connection)} FROM user_data"
+                        + where + " ORDER BY user_data.user_id", params)
+            while not stop.is_set():
+                batch = cur.fetchmany(batch_size)
+                if not batch or not put_or_stop(out, batch, stop):
+                    break
+    except Exception as exc:  # handed to the consuming thread
+        put_or_stop(out, Failure(exc), stop)
+    finally:
+        put_or_stop(out, DONE, stop)
+
+
+def _drain(out: queue.Queue) -> Iterator[list]:
+    """Yield batches from one worker queue until its DONE marker."""
+    while True:
+        item = out.get()
+        if item is DONE:
+            return
+        if isinstance(item, Failure):
+            raise item.exc
+        yield item
+
+
+def parallel_scan_batches(partitions: int = 4, batch_size: int = 1000,
+                          ordered: bool = False, queue_depth: int = 4,
+                          **criteria: Any) -> Iterator[List[dict]]:
+    """
+    Yield batches of user dicts read concurrently from *partitions* ranges.
+
+    Parameters
+    ----------
+    partitions : int
+        Number of key ranges, worker threads and connections (at most
+        the pool size).
+    batch_size : int
+        Rows per fetchmany call (and per yielded batch).
+    ordered : bool
+        If True, batches come out in user_id order (ranges are drained one
+        after another while later ranges read ahead); otherwise batches are
+        yielded as soon as any worker produces them.
+    queue_depth : int
+        Batches each worker may buffer ahead of the consumer.
+    criteria
+        Optional filters, pushed down as in seed.build_where, except
+        user_id ranges, which the partitions set.
+    """
+    if {"user_id__gte", "user_id__lt"} & criteria.keys():
+        raise ValueError("user_id range criteria are set by the partitions")
+    connection = connect_to_prodev()
+    if connection is None:
+        raise ConnectionError("Cannot connect to ALX_prodev")
+    with closing(connection):
+        bounds = partition_bounds(connection, cap_partitions(partitions))
+
+    stop = threading.Event()
+    if ordered:
+        queues = [queue.Queue(queue_depth) for _ in bounds]
+    else:
+        queues = [queue.Queue(queue_depth * len(bounds))] * len(bounds)
+
+    pool = ThreadPoolExecutor(max_workers=len(bounds),
+                              thread_name_prefix="user-scan")
+    try:
+        for bound, out in zip(bounds, queues):
+            pool.submit(_scan_range, bound, batch_size, criteria, out, stop)
+
+        if ordered:
+            for out in queues:
+                yield from _drain(out)
+        else:
+            remaining = len(bounds)
+            while remaining:
+                item = queues[0].get()
+                if item is DONE:
+                    remaining -= 1
+                elif isinstance(item, Failure):
+                    raise item.exc
+                else:
+                    yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parallel_scan(partitions: int = 4, batch_size: int = 1000,
+                  ordered: bool = False, **criteria: Any) -> Iterator[dict]:
+    """Yield user dicts one by one from parallel_scan_batches()."""
+    for batch in parallel_scan_batches(partitions, batch_size, ordered,
+                                       **criteria):
+        yield from batch
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+pipeline.py – Composable stages for the user_data generators.
+
+A stage plugs onto any iterable with ``|`` and stages compose the same
+way, so the filter / batch / aggregate loops can be written once:
+
+    stream_users() | filter_(lambda u: u["age"] > 25) | batch(500)
+    stream_user_ages() | reduce_(max)
+    adults = filter_(lambda u: u["age"] >= 18) | map_(itemgetter("email"))
+    for email in lazy_pagination(100) | flatten() | adults: ...
+
+Adjacent map_/filter_ stages are fused into one stage that runs as a
+stack of built-in ``map``/``filter`` iterators: no intermediate lists and
+no generator frame per stage. Every stage stays lazy except reduce_,
+which ends the pipeline and returns its value.
+
+The source is closed when the pipeline is exhausted or closed early, so
+a generator holding a pooled connection hands it back straight away.
+
+Functions
+---------
+map_(fn) / filter_(pred)           ➜ element-wise stages (fused)
+flatten()                          ➜ batches ➜ items
+batch(size)                        ➜ items ➜ lists of up to *size* items
+window(size, step)                 ➜ sliding tuples of *size* items
+parallel_map(fn, workers)          ➜ fn applied on a pool, order kept
+reduce_(fn, initial)               ➜ terminal fold to a single value
+"""
+
+import functools
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+_MISSING = object()
+
+
+def _close(source: Iterable) -> None:
+    close = getattr(source, "close", None)
+    if close is not None:
+        close()
+
+
+class Stage:
+    """One pipeline step; ``iterable | stage`` runs it, ``a | b`` composes."""
+
+    terminal = False
+
+    def apply(self, items: Iterator) -> Any:
+        """Turn the *items* iterator into this stage's output."""
+        raise NotImplementedError
+
+    def __or__(self, other: "Stage") -> "Pipeline":
+        return Pipeline(self, other)
+
+    def __ror__(self, source: Iterable) -> Any:
+        return Pipeline(self).run(source)
+
+    def __call__(self, source: Iterable) -> Any:
+        return Pipeline(self).run(source)
+
+
+class Pipeline(Stage):
+    """Stages applied in order, with adjacent element-wise stages fused."""
+
+    def __init__(self, *stages: Stage) -> None:
+        fused: list = []
+        for stage in stages:
+            parts = stage.stages if isinstance(stage, Pipeline) else (stage,)
+            for part in parts:
+                if fused and fused[-1].terminal:
+                    raise ValueError("No stage can follow reduce_()")
+                if (fused and isinstance(part, _Elementwise)
+                        and isinstance(fused[-1], _Elementwise)):
+                    fused[-1] = _Elementwise(fused[-1].steps + part.steps)
+                else:
+                    fused.append(part)
+        self.stages: Tuple[Stage, ...] = tuple(fused)
+        self.terminal = bool(fused) and fused[-1].terminal
+
+    def apply(self, items: Iterator) -> Any:
+        for stage in self.stages:
+            items = stage.apply(items)
+        return items
+
+    def run(self, source: Iterable) -> Any:
+        """Feed *source* through the pipeline (closing it when done)."""
+        if self.terminal:
+            try:
+                return self.apply(iter(source))
+            finally:
+                _close(source)
+        return self._stream(source)
+
+    def _stream(self, source: Iterable) -> Iterator:
+        try:
+            yield from self.apply(iter(source))
+        finally:
+            _close(source)
+
+
+class _Elementwise(Stage):
+    """A run of map_/filter_ steps, executed as built-in iterators."""
+
+    def __init__(self, steps: tuple) -> None:
+        self.steps = steps          # ((map | filter, fn), ...)
+
+    def apply(self, items: Iterator) -> Iterator:
+        for kind, fn in self.steps:
+            items = kind(fn, items)
+        return items
+
+
+def map_(fn: Callable[[Any], Any]) -> Stage:
+    """Apply *fn* to every item."""
+    return _Elementwise(((map, fn),))
+
+
+def filter_(predicate: Callable[[Any], bool]) -> Stage:
+    """Keep the items for which *predicate* is true."""
+    return _Elementwise(((filter, predicate),))
+
+
+class _Flatten(Stage):
+    def apply(self, items: Iterator) -> Iterator:
+        return chain.from_iterable(items)
+
+
+def flatten() -> Stage:
+    """Yield the items of each batch, e.g. after stream_users_in_batches."""
+    return _Flatten()
+
+
+class _Batch(Stage):
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("batch size must be at least 1")
+        self.size = size
+
+    def apply(self, items: Iterator) -> Iterator[list]:
+        return iter(lambda: list(islice(items, self.size)), [])
+
+
+def batch(size: int) -> Stage:
+    """Group items into lists of *size* (the last one may be shorter)."""
+    return _Batch(size)
+
+
+class _Window(Stage):
+    def __init__(self, size: int, step: int) -> None:
+        if size < 1 or step < 1:
+            raise ValueError("window size and step must be at least 1")
+        self.size = size
+        self.step = step
+
+    def apply(self, items: Iterator) -> Iterator[tuple]:
+        window = deque(islice(items, self.size), maxlen=self.size)
+        if len(window) < self.size:
+            return
+        yield tuple(window)
+        while True:
+            advance = list(islice(items, self.step))
+            if len(advance) < self.step:
+                return
+            window.extend(advance)
+            yield tuple(window)
+
+
+def window(size: int, step: int = 1) -> Stage:
+    """Yield full windows of *size* items, starting every *step* items."""
+    return _Window(size, step)
+
+
+class _ParallelMap(Stage):
+    def __init__(self, fn: Callable[[Any], Any], workers: int,
+                 executor: Executor | None, ahead: int | None) -> None:
+        self.fn = fn
+        self.workers = workers
+        self.executor = executor
+        self.ahead = ahead or 2 * workers
+
+    def apply(self, items: Iterator) -> Iterator:
+        pool = self.executor or ThreadPoolExecutor(
+            self.workers, thread_name_prefix="pipeline")
+        pending: deque = deque()
+        try:
+            for item in items:
+                pending.append(pool.submit(self.fn, item))
+                if len(pending) >= self.ahead:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if self.executor is None:
+                pool.shutdown(wait=True)
+
+
+def parallel_map(fn: Callable[[Any], Any], workers: int = 4,
+                 executor: Executor | None = None,
+                 ahead: int | None = None) -> Stage:
+    """
+    Apply *fn* to every item on a pool, yielding results in input order.
+
+    At most *ahead* calls (2 × *workers* by default) are in flight, so a
+    slow consumer does not make the pool run through the whole source.
+    Pass an *executor* (e.g. a ProcessPoolExecutor for CPU-bound *fn*)
+    to use it instead of a private thread pool.
+    """
+    return _ParallelMap(fn, workers, executor, ahead)
+
+
+class _Reduce(Stage):
+    terminal = True
+
+    def __init__(self, fn: Callable[[Any, Any], Any], initial: Any) -> None:
+        self.fn = fn
+        self.initial = initial
+
+    def apply(self, items: Iterator) -> Any:
+        if self.initial is _MISSING:
+            return functools.reduce(self.fn, items)
+        return functools.reduce(self.fn, items, self.initial)
+
+
+def reduce_(fn: Callable[[Any, Any], Any], initial: Any = _MISSING) -> Stage:
+    """Fold all items into one value with *fn*; ends the pipeline."""
+    return _Reduce(fn, initial)
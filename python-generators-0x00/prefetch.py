@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+prefetch.py – Opt-in read-ahead for the batch and page generators.
+
+``read_ahead(gen, depth)`` advances *gen* on a background thread while
+the caller is still working on the previous item, so the database round
+trip for batch N+1 overlaps with the processing of batch N:
+
+    for page in read_ahead(lazy_pagination(100), depth=2):
+        handle(page)
+
+At most *depth* items wait in the queue. Leaving the loop early (break,
+exception, ``close()``) stops the thread and closes *gen* on it, which
+returns its pooled connection.
+
+DONE, Failure and put_or_stop are the hand-off protocol between a
+producer thread and its consumer, shared with parallel_scan and
+async_streams.
+"""
+
+import queue
+import threading
+from typing import Any, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+DONE = object()        # end of the producer's items
+
+
+class Failure:
+    """Carries an exception raised by the source to the consuming thread."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def put_or_stop(out: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Block until *item* is queued or the consumer has gone away."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def read_ahead(source: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Yield the items of *source*, fetching up to *depth* items in advance.
+
+    *source* is iterated (and finally closed) only on the background
+    thread, so a generator holding a connection never shares it between
+    threads. Exceptions from *source* are re-raised in the caller.
+    """
+    stop = threading.Event()
+    out: queue.Queue = queue.Queue(maxsize=max(1, depth))
+
+    def produce() -> None:
+        iterator = None
+        try:
+            iterator = iter(source)
+            for item in iterator:
+                if not put_or_stop(out, item, stop):
+                    break
+        except Exception as exc:
+            put_or_stop(out, Failure(exc), stop)
+        finally:
+            try:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            except Exception as exc:
+                put_or_stop(out, Failure(exc), stop)
+            finally:
+                # Whatever happened above, the consumer must not wait on.
+                put_or_stop(out, DONE, stop)
+
+    worker = threading.Thread(target=produce, name="read-ahead", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = out.get()
+            if item is DONE:
+                return
+            if isinstance(item, Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        worker.join()
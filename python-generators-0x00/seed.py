@@ -5,22 +5,98 @@ seed.py – Set-up helper for the ALX_prodev demo database.
 Functions
 ---------
 connect_db()                 ➜ connection to the MySQL server (no default DB)
+get_pool(database)           ➜ shared ConnectionPool behind the connect_* helpers
 create_database(conn)        ➜ idempotently creates ALX_prodev
 connect_to_prodev()          ➜ connection already using ALX_prodev
 create_table(conn)           ➜ idempotently creates user_data table
+add_change_tracking(conn)    ➜ adds updated_at to an older user_data table
+update_indexes(conn)         ➜ refreshes secondary indexes of an older table
+migrate_user_key(conn)       ➜ rebuilds user_data with a BINARY(16) user_id
 insert_data(conn, csv_path)  ➜ bulk-inserts from user_data.csv (skips dups)
+load_csv(conn, csv_path)     ➜ chunked, resumable streaming CSV loader
+bulk_load_csv(conn, path)    ➜ LOAD DATA LOCAL INFILE fast path
+sync_csv(conn, csv_path)     ➜ upserts only rows that differ from the table
 stream_user_data(conn)       ➜ **generator** that yields rows one-by-one
+AdaptiveFetchSize()          ➜ self-tuning fetch size for stream_user_data
+build_where(**criteria)      ➜ parameterized WHERE clause for user_data
+user_columns(conn)           ➜ select list that returns user_id as text
+
+UserRow is a lightweight row record; pass ``row_factory=UserRow._make`` to
+the streaming helpers to build it straight from the raw tuples.
+
+Connections come from a bounded ConnectionPool; calling ``close()`` on
+one (or dropping the last reference to it) returns it to the pool with
+its session reset. connection_stats counts connections opened, reused,
+evicted, discarded and orphaned.
+
+user_id is stored either as CHAR(36) (the original schema) or, after
+migrate_user_key(), as a time-ordered BINARY(16). Queries that touch the
+key go through user_columns() / key_param(), so callers always see the
+textual UUID whichever layout the table has.
 """
 
 import csv
+import hashlib
 import os
 import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
 from contextlib import closing, contextmanager
-from typing import Dict, Generator, Iterator
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Generator, Iterator, NamedTuple, Tuple
 
 import mysql.connector
+from mysql.connector import errorcode
 from mysql.connector.connection import MySQLConnection
 
+connection_stats: Counter = Counter()
+
+USER_COLUMNS = ("user_id", "name", "email", "age")
+
+_LOOKUPS = {
+    "exact": "=",
+    "ne":    "<>",
+    "gt":    ">",
+    "gte":   ">=",
+    "lt":    "<",
+    "lte":   "<=",
+    "in":    "IN",
+}
+
+# Secondary indexes of user_data. idx_age covers the age filters and the
+# age aggregates (InnoDB appends the primary key), so neither reads rows.
+_INDEXES = {
+    "idx_updated_at": "(updated_at, user_id)",
+    "idx_age":        "(age, name, email)",
+    "idx_email":      "(email)",
+}
+
+# Errors meaning "LOAD DATA LOCAL is not allowed here", not a bad file.
+_LOCAL_INFILE_REFUSED = {
+    errorcode.ER_NOT_ALLOWED_COMMAND,
+    errorcode.ER_CLIENT_LOCAL_FILES_DISABLED,
+    errorcode.CR_LOAD_DATA_LOCAL_INFILE_REJECTED,
+}
+
+
+class SyncResult(NamedTuple):
+    """Row counts reported by sync_csv."""
+    inserted:  int
+    updated:   int
+    unchanged: int
+
+
+class UserRow(NamedTuple):
+    """One user_data row; a tuple, so no per-row ``__dict__``."""
+    user_id: str
+    name:    str
+    email:   str
+    age:     Decimal
+
 
 # ---------- Low-level helpers ---------- #
 def _credentials() -> Dict[str, str]:
@@ -34,11 +110,266 @@ def _credentials() -> Dict[str, str]:
     }
 
 
+# ---------- Connection pool ---------- #
+class PooledConnection:
+    """
+    Proxy around a pooled connection.
+
+    Behaves like the wrapped MySQLConnection, except that ``close()`` hands
+    the connection back to its pool instead of disconnecting. A proxy that
+    is garbage-collected without being closed gives its connection back
+    too, on the pool's next checkout.
+    """
+
+    __slots__ = ("_pool", "_raw", "_finalizer", "__weakref__")
+
+    def __init__(self, pool: "ConnectionPool", raw: MySQLConnection) -> None:
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_raw", raw)
+        # Runs inside the garbage collector: only queue the connection.
+        finalizer = weakref.finalize(self, pool._orphans.append, raw)
+        finalizer.atexit = False
+        object.__setattr__(self, "_finalizer", finalizer)
+
+    def _checked_out(self) -> MySQLConnection:
+        if self._raw is None:
+            raise mysql.connector.errors.OperationalError(
+                "Connection already returned to the pool")
+        return self._raw
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._checked_out(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._checked_out(), name, value)
+
+    def close(self) -> None:
+        """Return the connection to the pool (idempotent)."""
+        raw = self._raw
+        object.__setattr__(self, "_raw", None)
+        if raw is not None:
+            self._finalizer.detach()
+            self._pool.release(raw)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+
+    Parameters
+    ----------
+    factory : callable
+        Opens one new raw connection.
+    max_size : int, optional
+        Upper bound on open connections (idle + checked out).
+    max_idle : float, optional
+        Seconds after which an idle connection is closed instead of reused.
+    check_after : float, optional
+        Connections idle longer than this are pinged on checkout and
+        replaced if the server has gone away.
+    timeout : float, optional
+        Seconds to wait for a free connection before raising PoolError.
+    """
+
+    def __init__(self, factory: Callable[[], MySQLConnection],
+                 max_size: int = 8, max_idle: float = 300.0,
+                 check_after: float = 1.0, timeout: float = 30.0) -> None:
+        self._factory = factory
+        self._max_size = max_size
+        self._max_idle = max_idle
+        self._check_after = check_after
+        self._timeout = timeout
+        self._idle: list = []       # [(raw, last_used)], most recent last
+        self._orphans: deque = deque()  # from collected PooledConnections
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def max_size(self) -> int:
+        """Upper bound on open connections."""
+        return self._max_size
+
+    def _evict_idle(self) -> list:
+        """Drop idle connections past max_idle; caller holds the lock."""
+        cutoff = time.monotonic() - self._max_idle
+        stale = [raw for raw, used in self._idle if used < cutoff]
+        self._idle = [(raw, used) for raw, used in self._idle
+                      if used >= cutoff]
+        self._size -= len(stale)
+        connection_stats["evicted"] += len(stale)
+        return stale
+
+    def _release_orphans(self) -> None:
+        """Release the connections of garbage-collected proxies."""
+        while self._orphans:
+            raw = self._orphans.popleft()
+            with self._cond:
+                connection_stats["orphaned"] += 1
+            self.release(raw)
+
+    def _check_open(self) -> None:
+        """Raise PoolError after close(); caller holds the lock."""
+        if self._closed:
+            raise mysql.connector.errors.PoolError("Pool is closed")
+
+    def acquire(self) -> PooledConnection:
+        """Check out a healthy connection, opening one if the pool allows."""
+        deadline = time.monotonic() + self._timeout
+        while True:
+            self._release_orphans()
+            stale: list = []
+            try:
+                with self._cond:
+                    self._check_open()
+                    stale += self._evict_idle()
+                    while (not self._idle and self._size >= self._max_size
+                           and not self._orphans):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise mysql.connector.errors.PoolError(
+                                "No connection available within "
+                                f"{self._timeout}s")
+                        # Orphans are queued by the garbage collector
+                        # without a notify, so look again now and then.
+                        self._cond.wait(min(remaining, 1.0))
+                        self._check_open()
+                        stale += self._evict_idle()
+                    if self._idle:
+                        raw, used = self._idle.pop()
+                    elif self._size < self._max_size:
+                        raw, used = None, None
+                        self._size += 1
+                    else:
+                        continue        # release the orphans first
+            finally:
+                for conn in stale:
+                    _quietly_close(conn)
+
+            if raw is None:
+                try:
+                    raw = self._factory()
+                except BaseException:
+                    self._discard(None)
+                    raise
+                event = "opened"
+            elif (time.monotonic() - used > self._check_after
+                  and not raw.is_connected()):
+                self._discard(raw)
+                continue
+            else:
+                event = "reused"
+            with self._cond:
+                connection_stats[event] += 1
+                connection_stats["checkouts"] += 1
+            return PooledConnection(self, raw)
+
+    def release(self, raw: MySQLConnection) -> None:
+        """
+        Take *raw* back with a clean session.
+
+        The session is reset (open transaction rolled back, temporary
+        tables, user variables and session settings dropped) with one
+        COM_RESET_CONNECTION; there is no separate ping, a dead connection
+        fails the reset. Connections with unread results, that fail the
+        reset, or that come back after close() are discarded.
+        """
+        with self._cond:
+            closed = self._closed
+        try:
+            if closed or raw.unread_result or not raw.cmd_reset_connection():
+                self._discard(raw)
+                return
+        except mysql.connector.Error:
+            self._discard(raw)
+            return
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                self._idle.append((raw, time.monotonic()))
+                self._cond.notify()
+        if closed:
+            self._discard(raw)
+
+    def _discard(self, raw: MySQLConnection | None) -> None:
+        """Close *raw* (if any) and free its slot."""
+        if raw is not None:
+            _quietly_close(raw)
+        with self._cond:
+            if raw is not None:
+                connection_stats["discarded"] += 1
+            self._size -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Generator[PooledConnection, None, None]:
+        """``with pool.connection() as conn:`` – checkout and auto-return."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection (checked-out ones close on return)."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            _quietly_close(raw)
+        self._release_orphans()
+
+
+def _quietly_close(raw: MySQLConnection) -> None:
+    """Disconnect, ignoring errors from an already broken connection."""
+    try:
+        raw.close()
+    except mysql.connector.Error:
+        pass
+
+
+_pools: Dict[Tuple[str | None, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database: str | None = None,
+             allow_local_infile: bool = False) -> ConnectionPool:
+    """Return the shared pool for *database*, creating it on first use.
+
+    Sizing comes from MYSQL_POOL_SIZE and MYSQL_POOL_IDLE (seconds).
+    """
+    key = (database, allow_local_infile)
+    with _pools_lock:
+        if key not in _pools:
+            options = dict(_credentials(),
+                           allow_local_infile=allow_local_infile)
+            if database is not None:
+                options["database"] = database
+            _pools[key] = ConnectionPool(
+                lambda: mysql.connector.connect(**options),
+                max_size=int(os.getenv("MYSQL_POOL_SIZE", "8")),
+                max_idle=float(os.getenv("MYSQL_POOL_IDLE", "300")))
+        return _pools[key]
+
+
+def configure_pool(pool: ConnectionPool, database: str | None = None,
+                   allow_local_infile: bool = False) -> None:
+    """Install *pool* as the shared pool for *database* (closing the old)."""
+    with _pools_lock:
+        old = _pools.get((database, allow_local_infile))
+        _pools[(database, allow_local_infile)] = pool
+    if old is not None:
+        old.close()
+
+
 # ---------- Required prototypes ---------- #
-def connect_db() -> MySQLConnection | None:
+def connect_db() -> PooledConnection | None:
     """Connect to the MySQL *server* (no default database)."""
     try:
-        return mysql.connector.connect(**_credentials())
+        return get_pool().acquire()
     except mysql.connector.Error as exc:
         print(f"[ERROR] Cannot connect: {exc}", file=sys.stderr)
         return None
@@ -51,69 +382,602 @@ def create_database(connection: MySQLConnection) -> None:
     print("Database ALX_prodev ready")
 
 
-def connect_to_prodev() -> MySQLConnection | None:
-    """Return a connection *using* ALX_prodev."""
+def connect_to_prodev(
+        allow_local_infile: bool = False) -> PooledConnection | None:
+    """Return a connection *using* ALX_prodev.
+
+    Pass ``allow_local_infile=True`` for connections used by bulk_load_csv.
+    """
     try:
-        return mysql.connector.connect(database="ALX_prodev", **_credentials())
+        return get_pool("ALX_prodev", allow_local_infile).acquire()
     except mysql.connector.Error as exc:
         print(f"[ERROR] Cannot connect to ALX_prodev: {exc}", file=sys.stderr)
         return None
 
 
-def create_table(connection: MySQLConnection) -> None:
-    """Create user_data table with the required schema (UUID PK, indexed)."""
-    ddl = """
-    CREATE TABLE IF NOT EXISTS user_data (
-        user_id CHAR(36) PRIMARY KEY,
-        name    VARCHAR(255) NOT NULL,
-        email   VARCHAR(255) NOT NULL,
-        age     DECIMAL(4,0) NOT NULL,
-        INDEX (user_id)
+def user_data_ddl(table: str = "user_data", binary_key: bool = False) -> str:
+    """CREATE TABLE statement for user_data (or a same-shaped *table*).
+
+    ``binary_key=True`` stores user_id as a time-ordered BINARY(16).
+    """
+    indexes = ",\n".join(f"        INDEX {name} {columns}"
+                         for name, columns in _INDEXES.items())
+    return f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        user_id    {"BINARY(16)" if binary_key else "CHAR(36)"} PRIMARY KEY,
+        name       VARCHAR(255) NOT NULL,
+        email      VARCHAR(255) NOT NULL,
+        age        DECIMAL(4,0) NOT NULL,
+        updated_at DATETIME(6) NOT NULL
+                   DEFAULT CURRENT_TIMESTAMP(6)
+                   ON UPDATE CURRENT_TIMESTAMP(6),
+{indexes}
     ) ENGINE=InnoDB;
     """
+
+
+def create_table(connection: MySQLConnection) -> None:
+    """Create user_data table with the required schema (UUID PK, indexed)."""
     with closing(connection.cursor()) as cur:
-        cur.execute(ddl)
+        cur.execute(user_data_ddl())
+    add_change_tracking(connection)
+    update_indexes(connection)
     print("Table user_data created successfully")
 
 
-def insert_data(connection: MySQLConnection, csv_path: str) -> None:
-    """Insert rows from *csv_path* (skips duplicates via INSERT IGNORE)."""
+def add_change_tracking(connection: MySQLConnection) -> None:
+    """
+    Add updated_at (+ index) to a user_data table created before it existed.
+
+    Existing rows get the migration time as their first watermark.
+    No-op when the column is already there.
+    """
+    with closing(connection.cursor()) as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_data' "
+            "AND COLUMN_NAME = 'updated_at'")
+        (present,) = cur.fetchone()
+        if present:
+            return
+        cur.execute("""
+        ALTER TABLE user_data
+            ADD COLUMN updated_at DATETIME(6) NOT NULL
+                DEFAULT CURRENT_TIMESTAMP(6)
+                ON UPDATE CURRENT_TIMESTAMP(6),
+            ADD INDEX idx_updated_at (updated_at, user_id);
+        """)
+
+
+def update_indexes(connection: MySQLConnection) -> None:
+    """
+    Bring the secondary indexes of an existing user_data up to date.
+
+    Drops the ``INDEX (user_id)`` older tables carry next to the primary
+    key (same column, so it only costs writes and buffer pool) and adds
+    any index from _INDEXES that is missing. No-op when nothing changes.
+    """
+    with closing(connection.cursor()) as cur:
+        cur.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_data'")
+        present = {name for (name,) in cur.fetchall()}
+
+        changes = ["DROP INDEX user_id"] if "user_id" in present else []
+        changes += [f"ADD INDEX {name} {columns}"
+                    for name, columns in _INDEXES.items()
+                    if name not in present]
+        if changes:
+            cur.execute("ALTER TABLE user_data " + ", ".join(changes))
+
+
+def migrate_user_key(connection: MySQLConnection) -> bool:
+    """
+    Rebuild user_data with user_id stored as a time-ordered BINARY(16).
+
+    Rows are copied in key order into a new table (``UUID_TO_BIN(id, 1)``
+    moves the timestamp of version-1 UUIDs to the front), which is then
+    swapped in with an atomic RENAME. Stop writers while it runs: rows
+    written during the copy are lost. Returns False if already migrated.
+
+    New ids from new_user_id() append at the right edge of the primary key;
+    existing random (version-4) ids stay scattered but still shrink from 36
+    bytes to 16 in the key and in every secondary index.
+    """
+    global _binary_key
+    add_change_tracking(connection)
+    with closing(connection.cursor()) as cur:
+        if _user_id_is_binary(cur):
+            _binary_key = True
+            return False
+        cur.execute("DROP TABLE IF EXISTS user_data_binary")
+        cur.execute(user_data_ddl("user_data_binary", binary_key=True))
+        cur.execute(
+            "INSERT INTO user_data_binary "
+            "(user_id, name, email, age, updated_at) "
+            "SELECT UUID_TO_BIN(user_id, 1), name, email, age, updated_at "
+            "FROM user_data ORDER BY 1")
+        cur.execute("RENAME TABLE user_data TO user_data_char, "
+                    "user_data_binary TO user_data")
+        cur.execute("DROP TABLE user_data_char")
+    _binary_key = True
+    return True
+
+
+def insert_data(connection: MySQLConnection, csv_path: str,
+                bulk: bool = False, sync: bool = False) -> None:
+    """Insert rows from *csv_path* (skips duplicates via INSERT IGNORE).
+
+    ``bulk=True`` takes the LOAD DATA LOCAL INFILE path (bulk_load_csv)
+    on a connection from the ``allow_local_infile`` pool instead of
+    *connection*, which the server would refuse LOCAL INFILE to.
+    ``sync=True`` also updates rows whose values changed (sync_csv).
+    """
+    if sync:
+        result = sync_csv(connection, csv_path, progress=_report_progress)
+        print(file=sys.stderr)
+        print(f"{result.inserted} new rows inserted, {result.updated} "
+              f"updated, {result.unchanged} unchanged")
+        return
+    if bulk:
+        local = connect_to_prodev(allow_local_infile=True)
+        if local is None:
+            raise ConnectionError("Cannot open a LOCAL INFILE connection "
+                                  "to ALX_prodev")
+        with closing(local):
+            inserted = bulk_load_csv(local, csv_path,
+                                     progress=_report_progress)
+    else:
+        inserted = load_csv(connection, csv_path, progress=_report_progress)
+    print(file=sys.stderr)
+    print(f"{inserted} new rows inserted")
+
+
+# ---------- Extra: streaming, resumable CSV loader ---------- #
+def _report_progress(rows_done: int, rows_per_sec: float) -> None:
+    """Default progress callback: one overwritten line on stderr."""
+    print(f"\r{rows_done} rows loaded ({rows_per_sec:,.0f} rows/s)",
+          end="", file=sys.stderr, flush=True)
+
+
+def _checkpoint_source(csv_path: str) -> str:
+    """Checkpoint key: the file's path, size and mtime.
+
+    A file rewritten in place gets a new key, so its checkpoint from an
+    earlier version is not applied to it.
+    """
+    stat = os.stat(csv_path)
+    return f"{os.path.abspath(csv_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def _checkpoint(cur, source: str) -> int:
+    """Rows of *source* already committed by a previous load_csv run."""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS seed_checkpoint (
+        source    VARCHAR(512) PRIMARY KEY,
+        rows_done BIGINT NOT NULL
+    ) ENGINE=InnoDB;
+    """)
+    cur.execute("SELECT rows_done FROM seed_checkpoint WHERE source = %s",
+                (source,))
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def load_csv(connection: MySQLConnection, csv_path: str,
+             chunk_size: int = 1000, resume: bool = True,
+             progress: Callable[[int, float], None] | None = None) -> int:
+    """
+    Stream *csv_path* into user_data and return the number of new rows.
+
+    Parameters
+    ----------
+    connection : MySQLConnection
+    csv_path : str
+    chunk_size : int, optional
+        CSV rows read per chunk; each chunk is one multi-row
+        ``INSERT IGNORE`` committed in its own transaction.
+    resume : bool, optional
+        Skip the rows committed by an interrupted earlier run of the same,
+        unmodified file. The position is stored in seed_checkpoint within
+        each chunk's transaction (also with ``resume=False``, so a later
+        run can resume) and cleared once the whole file has been loaded.
+    progress : callable, optional
+        Called as ``progress(rows_done, rows_per_sec)`` after every chunk.
+    """
     if not os.path.isfile(csv_path):
         raise FileNotFoundError(f"{csv_path} does not exist")
+    source = _checkpoint_source(csv_path)
 
     with open(csv_path, newline="", encoding="utf-8") as fh, \
          closing(connection.cursor()) as cur:
+        done = _checkpoint(cur, source)
+        if not resume:
+            done = 0
         reader = csv.DictReader(fh)
-        rows = [
-            (row["user_id"], row["name"], row["email"], row["age"])
-            for row in reader
-        ]
-        sql = ("INSERT IGNORE INTO user_data "
-               "(user_id, name, email, age) VALUES (%s, %s, %s, %s)")
-        cur.executemany(sql, rows)
-    print(f"{cur.rowcount} new rows inserted")
+        for _ in islice(reader, done):
+            pass
+
+        row_marks = f"({key_param(connection)}, %s, %s, %s)"
+        inserted = 0
+        start, resumed_at = time.perf_counter(), done
+        while True:
+            chunk = [
+                (row["user_id"], row["name"], row["email"], row["age"])
+                for row in islice(reader, chunk_size)
+            ]
+            if not chunk:
+                break
+
+            values = ", ".join([row_marks] * len(chunk))
+            connection.start_transaction()
+            try:
+                cur.execute("INSERT IGNORE INTO user_data "
+                            "(user_id, name, email, age) VALUES " + values,
+                            [field for row in chunk for field in row])
+                inserted += cur.rowcount
+                done += len(chunk)
+                cur.execute(
+                    "INSERT INTO seed_checkpoint (source, rows_done) "
+                    "VALUES (%s, %s) "
+                    "ON DUPLICATE KEY UPDATE rows_done = VALUES(rows_done)",
+                    (source, done))
+                connection.commit()
+            except mysql.connector.Error:
+                connection.rollback()
+                raise
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(done, (done - resumed_at) / elapsed if elapsed else 0)
+
+        cur.execute("DELETE FROM seed_checkpoint WHERE source = %s",
+                    (source,))
+    return inserted
+
+
+# ---------- Extra: LOAD DATA LOCAL INFILE fast path ---------- #
+def bulk_load_csv(connection: MySQLConnection, csv_path: str,
+                  fallback: bool = True,
+                  progress: Callable[[int, float], None] | None = None
+                  ) -> int:
+    """
+    Bulk-load *csv_path* and return the number of new user_data rows.
+
+    The file is loaded with ``LOAD DATA LOCAL INFILE`` into a temporary
+    staging table and copied over with ``INSERT IGNORE ... SELECT``, so
+    duplicates are skipped exactly as in load_csv.
+
+    Parameters
+    ----------
+    connection : MySQLConnection
+        Must be opened with ``allow_local_infile=True``.
+    csv_path : str
+    fallback : bool, optional
+        When the client or server refuses LOCAL INFILE, fall back to the
+        batched load_csv path instead of raising.
+    progress : callable, optional
+        Passed on to load_csv when falling back.
+    """
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"{csv_path} does not exist")
+
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        header = next(csv.reader(fh))
+        fh.seek(0)
+        newline = "\\r\\n" if fh.readline().endswith("\r\n") else "\\n"
+    # Map CSV columns by name; anything unknown is read into a throwaway var.
+    targets = ", ".join(col if col in USER_COLUMNS else "@skip"
+                        for col in header)
+
+    with closing(connection.cursor()) as cur:
+        cur.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS user_data_staging (
+            user_id CHAR(36),
+            name    VARCHAR(255),
+            email   VARCHAR(255),
+            age     DECIMAL(4,0)
+        ) ENGINE=InnoDB;
+        """)
+        cur.execute("TRUNCATE TABLE user_data_staging")
+        try:
+            cur.execute(
+                "LOAD DATA LOCAL INFILE %s INTO TABLE user_data_staging "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                f"LINES TERMINATED BY '{newline}' IGNORE 1 LINES "
+                f"({targets})", (os.path.abspath(csv_path),))
+        except mysql.connector.Error as exc:
+            cur.execute("DROP TEMPORARY TABLE IF EXISTS user_data_staging")
+            if not fallback or exc.errno not in _LOCAL_INFILE_REFUSED:
+                raise
+            print(f"[WARN] LOCAL INFILE refused ({exc}); "
+                  "falling back to batched inserts", file=sys.stderr)
+            return load_csv(connection, csv_path, progress=progress)
+
+        cur.execute("INSERT IGNORE INTO user_data (user_id, name, email, age) "
+                    f"SELECT {key_param(connection, 'user_id')}, name, email, "
+                    "age FROM user_data_staging")
+        inserted = cur.rowcount
+        cur.execute("DROP TEMPORARY TABLE user_data_staging")
+    return inserted
+
+
+# ---------- Extra: hash-compare sync ---------- #
+# Row fingerprint over the non-key columns, computed identically by MySQL
+# (below) and by _row_hash() for the incoming CSV rows.
+_ROW_HASH_SQL = "MD5(CONCAT_WS(CHAR(31), name, email, age))"
+
+
+def _row_hash(name: str, email: str, age: str) -> str:
+    return hashlib.md5(
+        "\x1f".join((name, email, age)).encode("utf-8")).hexdigest()
+
+
+def sync_csv(connection: MySQLConnection, csv_path: str,
+             chunk_size: int = 1000,
+             progress: Callable[[int, float], None] | None = None,
+             ) -> SyncResult:
+    """
+    Make user_data match *csv_path*, writing only rows that differ.
+
+    Each chunk of CSV rows is fingerprinted and compared against the
+    fingerprints MySQL computes for the same keys in one ``IN`` query, so
+    unchanged rows cost 32 bytes on the wire and no write. New and
+    changed rows go out in one multi-row ``INSERT ... ON DUPLICATE KEY
+    UPDATE`` per chunk, in the same transaction as the comparison. Rows
+    missing from the CSV are left alone. Safe to re-run after a failure:
+    the chunks already applied compare as unchanged.
+
+    Parameters
+    ----------
+    connection : MySQLConnection
+    csv_path : str
+    chunk_size : int, optional
+        CSV rows compared and written per round trip pair.
+    progress : callable, optional
+        Called as ``progress(rows_done, rows_per_sec)`` after every chunk.
+    """
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"{csv_path} does not exist")
+
+    counts = Counter()
+    row_marks = f"({key_param(connection)}, %s, %s, %s)"
+    start, done = time.perf_counter(), 0
+    with open(csv_path, newline="", encoding="utf-8") as fh, \
+            closing(connection.cursor()) as cur:
+        reader = csv.DictReader(fh)
+        while True:
+            # The last occurrence of a user_id in a chunk wins.
+            chunk = {}
+            for row in islice(reader, chunk_size):
+                # As stored in DECIMAL(4,0), so "30.0" matches 30.
+                age = str(Decimal(row["age"]).quantize(
+                    Decimal(1), rounding=ROUND_HALF_UP))
+                chunk[row["user_id"]] = (row["name"], row["email"], age)
+            if not chunk:
+                break
+
+            connection.start_transaction()
+            try:
+                where, params = build_where(connection, user_id__in=chunk)
+                cur.execute(f"SELECT {key_column(connection)}, "
+                            f"{_ROW_HASH_SQL} FROM user_data" + where, params)
+                stored = dict(cur.fetchall())
+
+                changed = []
+                for user_id, (name, email, age) in chunk.items():
+                    old = stored.get(user_id)
+                    if old == _row_hash(name, email, age):
+                        counts["unchanged"] += 1
+                        continue
+                    counts["inserted" if old is None else "updated"] += 1
+                    changed.append((user_id, name, email, age))
+
+                if changed:
+                    cur.execute(
+                        "INSERT INTO user_data (user_id, name, email, age) "
+                        "VALUES " + ", ".join([row_marks] * len(changed))
+                        + " ON DUPLICATE KEY UPDATE name = VALUES(name), "
+                        "email = VALUES(email), age = VALUES(age)",
+                        [field for row in changed for field in row])
+                connection.commit()
+            except mysql.connector.Error:
+                connection.rollback()
+                raise
+
+            done += len(chunk)
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(done, done / elapsed if elapsed else 0)
+
+    return SyncResult(counts["inserted"], counts["updated"],
+                      counts["unchanged"])
 
 
 # ---------- Extra: the streaming generator ---------- #
+def _row_bytes(row: Any) -> int:
+    """Approximate memory held by one fetched row."""
+    return sys.getsizeof(row) + sum(sys.getsizeof(field) for field in row)
+
+
+class AdaptiveFetchSize:
+    """
+    Picks fetchmany() sizes for a streaming read.
+
+    Starts at *initial* and doubles while the time per row keeps improving
+    by at least *min_gain* (10% by default) and the next batch still fits
+    in *memory_budget* bytes, then settles on the best size it measured.
+
+    ``size`` is the size of the next fetch, ``settled`` whether growth has
+    stopped and ``history`` the (size, seconds per row) pairs measured on
+    the way there.
+    """
+
+    def __init__(self, initial: int = 64, maximum: int = 65_536,
+                 memory_budget: int = 8 * 2 ** 20,
+                 min_gain: float = 0.1) -> None:
+        self.size = initial
+        self.maximum = maximum
+        self.memory_budget = memory_budget
+        self.min_gain = min_gain
+        self.settled = False
+        self.history: list = []
+        self._best = (float("inf"), initial)    # (seconds per row, size)
+
+    def record(self, rows: list, seconds: float) -> None:
+        """Feed back one fetch of *rows* that took *seconds*."""
+        # A short batch is the end of the result, not a measurement.
+        if self.settled or not rows or len(rows) < self.size:
+            return
+        per_row = seconds / len(rows)
+        self.history.append((self.size, per_row))
+
+        fits = self.memory_budget // max(1, _row_bytes(rows[0]))
+        if self.size > fits:
+            self.size, self.settled = max(1, fits), True
+            return
+        best_per_row, _ = self._best
+        if per_row < best_per_row * (1 - self.min_gain):
+            self._best = (per_row, self.size)
+            grown = self.size * 2
+            if grown <= min(self.maximum, fits):
+                self.size = grown
+                return
+        self.size, self.settled = self._best[1], True
+
+
 def stream_user_data(connection: MySQLConnection,
-                     batch_size: int = 1) -> Iterator[tuple]:
+                     batch_size: int | AdaptiveFetchSize | None = None,
+                     row_factory: Callable[[tuple], Any] | None = None,
+                     ) -> Iterator[tuple]:
     """
     Yield rows from user_data **one by one** (lazy generator).
 
     Parameters
     ----------
     connection : MySQLConnection
-    batch_size : int, optional
+    batch_size : int or AdaptiveFetchSize, optional
         Internal fetch size from MySQL; rows are still yielded singly.
+        An int fixes it. By default it adapts (see AdaptiveFetchSize);
+        pass your own instance to inspect the sizes it chose.
+    row_factory : callable, optional
+        Applied to each raw row tuple, e.g. ``UserRow._make``.
     """
+    sizing = AdaptiveFetchSize() if batch_size is None else batch_size
+    fixed = isinstance(sizing, int)
+
     cur = connection.cursor()
-    cur.execute("SELECT user_id, name, email, age FROM user_data;")
+    cur.execute(f"SELECT {user_columns(connection)} FROM user_data;")
 
     while True:
-        batch = cur.fetchmany(batch_size)
+        start = time.perf_counter()
+        batch = cur.fetchmany(sizing if fixed else sizing.size)
+        if not fixed:
+            sizing.record(batch, time.perf_counter() - start)
         if not batch:
             break
+        if row_factory is not None:
+            batch = map(row_factory, batch)
         for row in batch:
             yield row
 
     cur.close()
+
+
+# ---------- Extra: predicate pushdown ---------- #
+def build_where(connection: MySQLConnection | None = None,
+                **criteria: Any) -> Tuple[str, tuple]:
+    """
+    Compile ``column__lookup=value`` criteria into a WHERE clause.
+
+    Lookups are exact (the default), ne, gt, gte, lt, lte and in, e.g.
+    ``build_where(age__gt=25)`` ➜ ``(" WHERE age > %s", (25,))``.
+    Returns ``("", ())`` when no criteria are given. Pass the *connection*
+    the query will run on when user_id may be filtered, so textual ids are
+    converted for a BINARY(16) key (see key_param).
+    """
+    key_mark = "%s" if connection is None else key_param(connection)
+    clauses, params = [], []
+    for key, value in criteria.items():
+        column, _, lookup = key.partition("__")
+        lookup = lookup or "exact"
+        if column not in USER_COLUMNS:
+            raise ValueError(f"Unknown user_data column: {column}")
+        if lookup not in _LOOKUPS:
+            raise ValueError(f"Unsupported lookup: {lookup}")
+
+        if lookup == "in":
+            values = tuple(value)
+            if not values:
+                clauses.append("FALSE")
+                continue
+            mark = key_mark if column == "user_id" else "%s"
+            marks = ", ".join([mark] * len(values))
+            clauses.append(f"{column} IN ({marks})")
+            params.extend(values)
+        else:
+            mark = key_mark if column == "user_id" else "%s"
+            clauses.append(f"{column} {_LOOKUPS[lookup]} {mark}")
+            params.append(value)
+
+    if not clauses:
+        return "", ()
+    return " WHERE " + " AND ".join(clauses), tuple(params)
+
+
+# ---------- Extra: key format ---------- #
+_binary_key: bool | None = None   # cached by key_is_binary()
+
+
+def _user_id_is_binary(cur) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_data' "
+        "AND COLUMN_NAME = 'user_id' AND DATA_TYPE = 'binary'")
+    (binary,) = cur.fetchone()
+    return bool(binary)
+
+
+def key_is_binary(connection: MySQLConnection) -> bool:
+    """True once user_data.user_id is a BINARY(16) (see migrate_user_key).
+
+    Looked up on first use and cached for the life of the process.
+    """
+    global _binary_key
+    if _binary_key is None:
+        with closing(connection.cursor()) as cur:
+            _binary_key = _user_id_is_binary(cur)
+    return _binary_key
+
+
+def key_column(connection: MySQLConnection) -> str:
+    """SQL expression reading user_id as its textual UUID."""
+    if key_is_binary(connection):
+        return "BIN_TO_UUID(user_id, 1)"
+    return "user_id"
+
+
+def key_param(connection: MySQLConnection, operand: str = "%s") -> str:
+    """Wrap *operand* (a textual UUID) so it compares against user_id."""
+    if key_is_binary(connection):
+        return f"UUID_TO_BIN({operand}, 1)"
+    return operand
+
+
+def user_columns(connection: MySQLConnection) -> str:
+    """
+    Select list for ``user_id, name, email, age`` in either key layout.
+
+    Order by ``user_data.user_id`` alongside it: the bare name would
+    resolve to the textual alias rather than the indexed column.
+    """
+    key = key_column(connection)
+    if key != "user_id":
+        key += " AS user_id"
+    return ", ".join((key, *USER_COLUMNS[1:]))
+
+
+def new_user_id() -> str:
+    """A fresh version-1 (time-based) UUID, ordered by UUID_TO_BIN(id, 1)."""
+    return str(uuid.uuid1())
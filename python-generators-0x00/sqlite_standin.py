@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+sqlite_standin.py – Run the user_data helpers on SQLite instead of MySQL.
+
+A small subset of mysql-connector's connection/cursor interface over
+sqlite3, enough for seed.py and the generators to run unchanged when no
+MySQL server is around (benchmarks, demos, CI). The MySQL statements they
+issue are rewritten to SQLite on the fly; sqlite3 errors are re-raised as
+mysql.connector errors so the existing ``except Error`` paths still apply.
+
+It is not a general MySQL emulator: anything outside that subset (BINARY
+keys, LOAD DATA LOCAL INFILE, NOW(6)...) fails with a mysql.connector
+error like an unsupported feature on a real server would.
+
+Functions
+---------
+install(path)        ➜ route seed's shared pools to the SQLite file *path*
+connect(path)        ➜ one StandInConnection
+translate(sql)       ➜ [SQLite statements] for one MySQL statement
+"""
+
+import hashlib
+import itertools
+import re
+import sqlite3
+from typing import Any, Iterator, List, Sequence
+
+import mysql.connector
+from mysql.connector import errorcode
+from mysql.connector import errors
+
+import seed
+
+# Statements executed by this process, answered for
+# ``SHOW GLOBAL STATUS LIKE 'Questions'`` like MySQL's own counter.
+_questions = itertools.count(1)
+
+_NOW = "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+
+_INLINE_INDEX = re.compile(r",\s*INDEX\s+(\w+\s+)?\(([^)]*)\)", re.I)
+_CREATE_TABLE = re.compile(r"CREATE\s+(?:TEMPORARY\s+)?TABLE\s+"
+                           r"(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.I)
+_UPSERT = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE\s+(.*)$", re.I | re.S)
+_COLUMNS_QUERY = re.compile(
+    r"FROM\s+information_schema\.COLUMNS\s+WHERE.*TABLE_NAME\s*=\s*'(\w+)'"
+    r".*COLUMN_NAME\s*=\s*'(\w+)'(.*DATA_TYPE\s*=\s*'(\w+)')?", re.I | re.S)
+_INDEX_QUERY = re.compile(
+    r"FROM\s+information_schema\.STATISTICS\s+WHERE.*TABLE_NAME\s*=\s*"
+    r"'(\w+)'", re.I | re.S)
+
+
+def translate(sql: str) -> List[str]:
+    """
+    Rewrite one MySQL statement into the SQLite statement(s) it means.
+
+    Returns an empty list for statements without a SQLite counterpart
+    that can safely be skipped (CREATE DATABASE, USE).
+    """
+    sql = sql.strip().rstrip(";").replace("%s", "?")
+    words = sql.upper().split(None, 2)
+    if words[:1] == ["USE"] or words[:2] == ["CREATE", "DATABASE"]:
+        return []
+
+    if "LOAD DATA" in sql.upper():
+        raise errors.ProgrammingError(
+            "LOAD DATA LOCAL INFILE is not available on the SQLite stand-in",
+            errno=errorcode.ER_NOT_ALLOWED_COMMAND)
+
+    match = _COLUMNS_QUERY.search(sql)
+    if match:
+        table, column, _, data_type = match.groups()
+        query = (f"SELECT COUNT(*) FROM pragma_table_info('{table}') "
+                 f"WHERE name = '{column}'")
+        if data_type:
+            query += f" AND lower(type) LIKE '{data_type.lower()}%'"
+        return [query]
+
+    match = _INDEX_QUERY.search(sql)
+    if match:
+        return [f"SELECT name FROM pragma_index_list('{match.group(1)}')"]
+
+    sql = re.sub(r"\bENGINE\s*=\s*\w+", "", sql, flags=re.I)
+    sql = re.sub(r"\bINSERT\s+IGNORE\b", "INSERT OR IGNORE", sql, flags=re.I)
+    sql = re.sub(r"\bTRUNCATE\s+TABLE\b", "DELETE FROM", sql, flags=re.I)
+    sql = re.sub(r"\bDROP\s+TEMPORARY\s+TABLE\b", "DROP TABLE", sql,
+                 flags=re.I)
+    sql = re.sub(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP(\(\d\))?", "", sql,
+                 flags=re.I)
+    sql = re.sub(r"\bCURRENT_TIMESTAMP\(\d\)", _NOW, sql, flags=re.I)
+
+    match = _UPSERT.search(sql)
+    if match:
+        assignments = re.sub(r"VALUES\((\w+)\)", r"excluded.\1",
+                             match.group(1))
+        sql = sql[:match.start()] + "ON CONFLICT DO UPDATE SET " + assignments
+
+    match = _CREATE_TABLE.match(sql)
+    if match:
+        table = match.group(1)
+        indexes = [
+            f"CREATE INDEX IF NOT EXISTS "
+            f"{(name or '').strip() or table + '_' + columns.split(',')[0]}"
+            f" ON {table} ({columns})"
+            for name, columns in _INLINE_INDEX.findall(sql)
+        ]
+        return [_INLINE_INDEX.sub("", sql), *indexes]
+    return [sql]
+
+
+def _wrap(exc: sqlite3.Error) -> mysql.connector.Error:
+    """The mysql.connector error matching a sqlite3 one."""
+    if isinstance(exc, sqlite3.IntegrityError):
+        return errors.IntegrityError(str(exc))
+    if isinstance(exc, sqlite3.OperationalError):
+        return errors.OperationalError(str(exc))
+    if isinstance(exc, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(str(exc))
+    return errors.DatabaseError(str(exc))
+
+
+class StandInCursor:
+    """Cursor with mysql-connector's tuple / dictionary row interface."""
+
+    def __init__(self, connection: "StandInConnection",
+                 dictionary: bool = False) -> None:
+        self._connection = connection
+        self._dictionary = dictionary
+        self._cursor = None
+        self.rowcount = -1
+
+    @property
+    def column_names(self) -> tuple:
+        if self._cursor is None or self._cursor.description is None:
+            return ()
+        return tuple(col[0] for col in self._cursor.description)
+
+    def _rows(self, rows: Sequence[tuple]) -> list:
+        if not self._dictionary:
+            return list(rows)
+        names = self.column_names
+        return [dict(zip(names, row)) for row in rows]
+
+    def execute(self, operation: str, params: Sequence[Any] = ()) -> None:
+        asked = next(_questions)
+        if re.match(r"\s*SHOW\s+GLOBAL\s+STATUS\s+LIKE\s+'Questions'",
+                    operation, re.I):
+            statements, params = ["SELECT 'Questions', ?"], (asked,)
+        else:
+            statements = translate(operation)
+        raw = self._connection._raw
+        try:
+            for statement in statements:
+                self._cursor = raw.execute(
+                    statement, tuple(params) if "?" in statement else ())
+        except sqlite3.Error as exc:
+            raise _wrap(exc) from exc
+        self.rowcount = self._cursor.rowcount if self._cursor else 0
+
+    def executemany(self, operation: str,
+                    seq_params: Sequence[Sequence[Any]]) -> None:
+        for params in seq_params:
+            self.execute(operation, params)
+
+    def fetchone(self) -> Any:
+        row = self._cursor.fetchone() if self._cursor else None
+        return None if row is None else self._rows([row])[0]
+
+    def fetchmany(self, size: int = 1) -> list:
+        return self._rows(self._cursor.fetchmany(size) if self._cursor
+                          else [])
+
+    def fetchall(self) -> list:
+        return self._rows(self._cursor.fetchall() if self._cursor else [])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.fetchone, None)
+
+    def close(self) -> None:
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+
+
+class StandInConnection:
+    """The parts of MySQLConnection that seed's pool and helpers use."""
+
+    unread_result = False
+
+    def __init__(self, path: str) -> None:
+        self._raw = sqlite3.connect(path, isolation_level=None,
+                                    check_same_thread=False)
+        self._raw.execute("PRAGMA journal_mode=WAL")
+        self._raw.execute("PRAGMA synchronous=NORMAL")
+        # MySQL built-ins used by seed.sync_csv's row fingerprint.
+        self._raw.create_function(
+            "MD5", 1, lambda text: hashlib.md5(
+                str(text).encode("utf-8")).hexdigest(), deterministic=True)
+        self._raw.create_function(
+            "CONCAT_WS", -1, lambda sep, *args: sep.join(
+                str(arg) for arg in args if arg is not None),
+            deterministic=True)
+        self.database = "ALX_prodev"
+        self.autocommit = True
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._raw.in_transaction
+
+    def cursor(self, dictionary: bool = False, buffered: bool | None = None,
+               **_: Any) -> StandInCursor:
+        return StandInCursor(self, dictionary)
+
+    def start_transaction(self) -> None:
+        self._raw.execute("BEGIN")
+
+    def commit(self) -> None:
+        if self._raw.in_transaction:
+            self._raw.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self._raw.in_transaction:
+            self._raw.execute("ROLLBACK")
+
+    def is_connected(self) -> bool:
+        return True
+
+    def reset_session(self) -> None:
+        self.rollback()
+
+    def cmd_reset_connection(self) -> bool:
+        self.rollback()
+        return True
+
+    def close(self) -> None:
+        self._raw.close()
+
+
+def connect(path: str) -> StandInConnection:
+    """Open one stand-in connection to the SQLite database at *path*."""
+    try:
+        return StandInConnection(path)
+    except sqlite3.Error as exc:
+        raise _wrap(exc) from exc
+
+
+def install(path: str, max_size: int = 8) -> None:
+    """
+    Point every shared seed pool at the SQLite database file *path*.
+
+    After this, seed.connect_db() / connect_to_prodev() and everything built
+    on them read and write *path*. Call it in every process that should
+    use the stand-in.
+    """
+    for database in (None, "ALX_prodev"):
+        for allow_local_infile in (False, True):
+            seed.configure_pool(
+                seed.ConnectionPool(lambda: connect(path), max_size=max_size),
+                database, allow_local_infile)
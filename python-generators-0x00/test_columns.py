@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Unit tests for the column-oriented batches in columns."""
+
+import unittest
+from decimal import Decimal
+
+from parameterized import parameterized
+
+from columns import StringColumn, numpy, to_columns
+
+ROWS = [
+    ("a", "Ann", "ann@x", Decimal(30)),
+    ("b", "", "bob@x", Decimal(0)),
+    ("c", "Zoë Ω", "zoe@x", Decimal(-5)),
+    ("d", "Dee", "", Decimal(9999)),
+]
+
+
+class TestStringColumn(unittest.TestCase):
+    """Test suite for StringColumn."""
+
+    values = ["", "a", "", "béta", "Ω" * 3, ""]
+
+    def test_round_trip(self):
+        """Iteration, indexing and len give back the original strings."""
+        column = StringColumn(self.values)
+        self.assertEqual(list(column), self.values)
+        self.assertEqual([column[i] for i in range(len(column))],
+                         self.values)
+        self.assertEqual(len(column), len(self.values))
+
+    @parameterized.expand([
+        (-1,), (-len(values),), (slice(1, 5, 2),), (slice(None, None, -1),),
+    ])
+    def test_negative_indexes_and_slices(self, index):
+        """Indexing behaves like the equivalent list."""
+        self.assertEqual(StringColumn(self.values)[index], self.values[index])
+
+    def test_out_of_range(self):
+        """Indexes past either end raise IndexError."""
+        column = StringColumn(self.values)
+        for index in (len(self.values), -len(self.values) - 1):
+            with self.assertRaises(IndexError):
+                column[index]
+
+    def test_empty(self):
+        """An empty column has no items."""
+        self.assertEqual(list(StringColumn([])), [])
+
+
+class TestToColumns(unittest.TestCase):
+    """Test suite for to_columns / UserColumns."""
+
+    def test_rows_round_trip(self):
+        """rows() gives back the input tuples, ages as Decimal."""
+        batch = to_columns(ROWS)
+        self.assertEqual(len(batch), len(ROWS))
+        self.assertEqual(list(batch.rows()), ROWS)
+        self.assertTrue(all(isinstance(row[3], Decimal)
+                            for row in batch.rows()))
+
+    def test_negative_ages_are_kept(self):
+        """The age column is signed, so DECIMAL(4,0) values survive."""
+        self.assertEqual(list(to_columns(ROWS).age), [30, 0, -5, 9999])
+        self.assertEqual(to_columns(ROWS).age.typecode, "h")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpy_ages(self):
+        """With NumPy the ages are a signed int16 ndarray."""
+        ages = to_columns(ROWS, use_numpy=True).age
+        self.assertEqual(ages.dtype, numpy.int16)
+        self.assertEqual(ages.tolist(), [30, 0, -5, 9999])
+
+
+if __name__ == "__main__":
+    unittest.main()
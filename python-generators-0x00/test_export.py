@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Unit tests for export.export_users, run on the SQLite stand-in."""
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from contextlib import closing
+
+import seed
+import sqlite_standin
+from bench import write_synthetic_csv
+from export import export_users, pyarrow
+
+
+class TestExportUsers(unittest.TestCase):
+    """Test suite for export_users."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Seed 5000 synthetic users into a stand-in database."""
+        cls.tmp = tempfile.TemporaryDirectory()
+        sqlite_standin.install(os.path.join(cls.tmp.name, "db.sqlite"))
+        csv_path = os.path.join(cls.tmp.name, "users.csv")
+        write_synthetic_csv(csv_path, 5000)
+        with closing(seed.connect_to_prodev()) as conn:
+            seed.create_table(conn)
+            seed.load_csv(conn, csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_ndjson_single_file(self):
+        """Filters are pushed down and every line is one JSON object."""
+        path = os.path.join(self.tmp.name, "old.ndjson")
+        result = export_users(path, batch_size=700, age__gt=90)
+        with open(path, encoding="utf-8") as fh:
+            users = [json.loads(line) for line in fh]
+        self.assertEqual(result.rows, len(users))
+        self.assertTrue(users)
+        self.assertTrue(all(user["age"] > 90 for user in users))
+
+    def test_partitions_cover_every_row_once(self):
+        """Parallel gzip partitions hold each user exactly once."""
+        out = os.path.join(self.tmp.name, "parts")
+        result = export_users(out, batch_size=400, compression="gzip",
+                              partitions=3)
+        ids = []
+        for path in result.files:
+            self.assertTrue(path.endswith(".ndjson.gz"))
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                ids.extend(json.loads(line)["user_id"] for line in fh)
+        self.assertEqual(result.rows, 5000)
+        self.assertEqual(len(set(ids)), 5000)
+        self.assertFalse([name for name in os.listdir(out)
+                          if name.endswith(".tmp")])
+
+    def test_bad_arguments(self):
+        """Unknown formats and codecs are rejected up front."""
+        with self.assertRaises(ValueError):
+            export_users(os.path.join(self.tmp.name, "x"), "csv")
+        with self.assertRaises(ValueError):
+            export_users(os.path.join(self.tmp.name, "x"), compression="zip")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_parquet(self):
+        """A parquet export reads back with the same row count."""
+        path = os.path.join(self.tmp.name, "users.parquet")
+        result = export_users(path, "parquet", compression="snappy")
+        self.assertEqual(pyarrow.parquet.read_table(path).num_rows,
+                         result.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
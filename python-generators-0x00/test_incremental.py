@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Unit tests for the watermark persistence in the incremental module."""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from incremental import Watermark, load_watermark, save_watermark
+
+
+class TestWatermark(unittest.TestCase):
+    """Test suite for load_watermark / save_watermark."""
+
+    def setUp(self):
+        """Point every test at a fresh state file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_file_starts_from_the_beginning(self):
+        """No state file means an empty watermark."""
+        self.assertEqual(load_watermark(self.path), Watermark())
+
+    def test_round_trip(self):
+        """A saved watermark is read back unchanged, microseconds included."""
+        mark = Watermark(datetime(2026, 3, 1, 12, 30, 5, 123456), "abc")
+        save_watermark(mark, self.path)
+        self.assertEqual(load_watermark(self.path), mark)
+
+    def test_save_replaces_atomically(self):
+        """Saving twice keeps only the latest mark and no temp file."""
+        save_watermark(Watermark(datetime(2026, 1, 1), "a"), self.path)
+        save_watermark(Watermark(datetime(2026, 1, 2), "b"), self.path)
+        self.assertEqual(load_watermark(self.path).user_id, "b")
+        self.assertEqual(os.listdir(self.tmp.name), ["state.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
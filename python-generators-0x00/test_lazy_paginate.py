@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Unit tests for 2-lazy_paginate, run on the SQLite stand-in."""
+
+import importlib
+import os
+import tempfile
+import unittest
+from contextlib import closing
+from unittest.mock import patch
+
+import seed
+import sqlite_standin
+from bench import write_synthetic_csv
+
+lazy = importlib.import_module("2-lazy_paginate")
+
+
+class TestLazyPagination(unittest.TestCase):
+    """Test suite for the offset and keyset page generators."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Seed 250 synthetic users into a stand-in database."""
+        cls.tmp = tempfile.TemporaryDirectory()
+        sqlite_standin.install(os.path.join(cls.tmp.name, "db.sqlite"))
+        csv_path = os.path.join(cls.tmp.name, "users.csv")
+        write_synthetic_csv(csv_path, 250)
+        with closing(seed.connect_to_prodev()) as conn:
+            seed.create_table(conn)
+            seed.load_csv(conn, csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_keyset_pages_cover_every_user_once(self):
+        """Keyset pages are full, ordered and disjoint."""
+        pages = list(lazy.lazy_keyset_pagination(100))
+        ids = [user["user_id"] for page in pages for user in page]
+        self.assertEqual([len(page) for page in pages], [100, 100, 50])
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_offset_pages(self):
+        """Offset pages add up to the whole table."""
+        self.assertEqual(sum(map(len, lazy.lazy_pagination(100))), 250)
+
+    def test_no_connection_raises(self):
+        """A failed connect is reported once, not retried recursively."""
+        with patch.object(lazy, "connect_to_prodev", return_value=None):
+            with self.assertRaises(ConnectionError):
+                lazy.paginate_users(10, 0)
+            with self.assertRaises(ConnectionError):
+                lazy.paginate_users_keyset(10)
+            with self.assertRaises(ConnectionError):
+                next(lazy.lazy_keyset_pagination(10))
+
+
+if __name__ == "__main__":
+    unittest.main()
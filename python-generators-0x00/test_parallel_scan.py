@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Unit tests for parallel_scan, run on the SQLite stand-in."""
+
+import os
+import tempfile
+import time
+import unittest
+from contextlib import closing
+from unittest.mock import patch
+
+import seed
+import sqlite_standin
+from bench import write_synthetic_csv
+from parallel_scan import (cap_partitions, parallel_scan,
+                           parallel_scan_batches, partition_bounds)
+
+
+class TestPartitionBounds(unittest.TestCase):
+    """Test suite for partition_bounds on tiny tables."""
+
+    def setUp(self):
+        self.conn = sqlite_standin.connect(":memory:")
+        patcher = patch.object(seed, "_binary_key", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        seed.create_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_empty_table(self):
+        """No rows: one open range."""
+        self.assertEqual(partition_bounds(self.conn, 4), [(None, None)])
+
+    def test_single_row(self):
+        """One row cannot be split."""
+        with closing(self.conn.cursor()) as cur:
+            cur.execute("INSERT INTO user_data (user_id, name, email, age) "
+                        "VALUES ('a', 'Ann', 'a@x', 30)")
+        self.assertEqual(partition_bounds(self.conn, 4), [(None, None)])
+
+
+class TestParallelScan(unittest.TestCase):
+    """Test suite for parallel_scan_batches."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Seed 2000 synthetic users into a stand-in database."""
+        cls.tmp = tempfile.TemporaryDirectory()
+        sqlite_standin.install(os.path.join(cls.tmp.name, "db.sqlite"),
+                               max_size=4)
+        csv_path = os.path.join(cls.tmp.name, "users.csv")
+        write_synthetic_csv(csv_path, 2000)
+        with closing(seed.connect_to_prodev()) as conn:
+            seed.create_table(conn)
+            seed.load_csv(conn, csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_every_row_once_in_order(self):
+        """Ordered scans return each user once, in key order."""
+        ids = [user["user_id"]
+               for user in parallel_scan(4, batch_size=128, ordered=True)]
+        self.assertEqual(len(ids), 2000)
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_partitions_capped_at_pool_size(self):
+        """More partitions than pooled connections are not used."""
+        self.assertEqual(cap_partitions(50), 4)
+        self.assertEqual(cap_partitions(0), 1)
+        rows = sum(map(len, parallel_scan_batches(50, batch_size=500)))
+        self.assertEqual(rows, 2000)
+
+    def test_early_close_does_not_stall(self):
+        """Closing after one batch stops the workers promptly."""
+        started = time.monotonic()
+        batches = parallel_scan_batches(4, batch_size=10, queue_depth=1)
+        next(batches)
+        batches.close()
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_range_criteria_rejected(self):
+        """user_id ranges belong to the partitions."""
+        with self.assertRaises(ValueError):
+            next(parallel_scan_batches(2, user_id__gte="a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
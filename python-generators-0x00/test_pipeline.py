@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Unit tests for the pipeline stages."""
+
+import threading
+import time
+import unittest
+
+from parameterized import parameterized
+
+from pipeline import (Pipeline, batch, filter_, flatten, map_, parallel_map,
+                      reduce_, window)
+
+
+class TestStages(unittest.TestCase):
+    """Test suite for the individual stages."""
+
+    def test_map_filter_batch(self):
+        """Stages chain onto a plain iterable and stay lazy."""
+        out = range(10) | filter_(lambda n: n % 2) | map_(str) | batch(2)
+        self.assertEqual(list(out), [["1", "3"], ["5", "7"], ["9"]])
+
+    def test_adjacent_elementwise_stages_fuse(self):
+        """map_/filter_ runs collapse into a single stage."""
+        pipe = map_(abs) | filter_(bool) | map_(str) | batch(3) | map_(len)
+        self.assertEqual(len(pipe.stages), 3)
+        self.assertEqual(list(range(-4, 4) | pipe), [3, 3, 1])
+
+    @parameterized.expand([
+        ("sliding", 3, 1, [(0, 1, 2), (1, 2, 3), (2, 3, 4)]),
+        ("tumbling", 2, 2, [(0, 1), (2, 3)]),
+        ("sparse", 1, 3, [(0,), (3,)]),
+        ("too_short", 6, 1, []),
+    ])
+    def test_window(self, _, size, step, expected):
+        """Only full windows are produced."""
+        self.assertEqual(list(range(5) | window(size, step)), expected)
+
+    def test_flatten_and_reduce(self):
+        """Batches flatten back to items; reduce_ returns a value."""
+        self.assertEqual([[1, 2], [3]] | flatten() | reduce_(max), 3)
+        self.assertEqual([] | reduce_(lambda a, b: a + b, 0), 0)
+
+    def test_nothing_follows_reduce(self):
+        """reduce_ ends a pipeline."""
+        with self.assertRaises(ValueError):
+            reduce_(max) | map_(str)
+
+    def test_parallel_map_keeps_order(self):
+        """Results come back in input order despite uneven latencies."""
+        def slow_square(n):
+            time.sleep(0.001 * (n % 3))
+            return n * n
+        self.assertEqual(list(range(20) | parallel_map(slow_square, 4)),
+                         [n * n for n in range(20)])
+
+    def test_parallel_map_bounds_work_in_flight(self):
+        """A stalled consumer stops the pool after *ahead* calls."""
+        calls = []
+        lock = threading.Lock()
+
+        def record(n):
+            with lock:
+                calls.append(n)
+            return n
+
+        out = range(1000) | parallel_map(record, workers=2, ahead=4)
+        next(out)
+        time.sleep(0.05)
+        self.assertLessEqual(len(calls), 5)
+        out.close()
+
+
+class TestPipelineSource(unittest.TestCase):
+    """Test suite for how a pipeline treats its source generator."""
+
+    def test_source_closed_on_early_exit(self):
+        """Leaving the loop early closes the source generator."""
+        closed = []
+
+        def source():
+            try:
+                yield from range(100)
+            finally:
+                closed.append(True)
+
+        for _ in source() | map_(str):
+            break
+        self.assertEqual(closed, [True])
+
+    def test_pipeline_objects_are_reusable(self):
+        """A composed pipeline can run over several sources."""
+        pipe = Pipeline(filter_(lambda n: n > 1), map_(str))
+        self.assertEqual(list([1, 2] | pipe), ["2"])
+        self.assertEqual(list(pipe([3])), ["3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
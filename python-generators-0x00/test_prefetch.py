@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Unit tests for read_ahead and the async offload behind async_streams."""
+
+import asyncio
+import threading
+import unittest
+
+from async_streams import _offload
+from prefetch import read_ahead
+
+
+class Source:
+    """Generator factory recording when, and on which thread, it closed."""
+
+    def __init__(self, n=5, fail_at=None):
+        self.n = n
+        self.fail_at = fail_at
+        self.closed = False
+        self.closed_on = None
+
+    def __call__(self):
+        try:
+            for i in range(self.n):
+                if i == self.fail_at:
+                    raise ValueError("boom")
+                yield i
+        finally:
+            self.closed = True
+            self.closed_on = threading.current_thread()
+
+
+class TestReadAhead(unittest.TestCase):
+    """Test suite for read_ahead."""
+
+    def test_yields_all_items(self):
+        """Every item arrives in order and the source is closed."""
+        source = Source()
+        self.assertEqual(list(read_ahead(source(), 2)), [0, 1, 2, 3, 4])
+        self.assertTrue(source.closed)
+
+    def test_exception_is_reraised(self):
+        """An error in the source reaches the consumer."""
+        with self.assertRaisesRegex(ValueError, "boom"):
+            list(read_ahead(Source(fail_at=2)(), 1))
+
+    def test_iter_failure_is_reraised(self):
+        """A source that cannot be iterated fails instead of hanging."""
+        with self.assertRaises(TypeError):
+            list(read_ahead(42, 1))
+
+    def test_close_failure_does_not_hang(self):
+        """A source whose close() raises still ends the stream."""
+        class Unclosable:
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                raise StopIteration
+
+            def close(self):
+                raise RuntimeError("close failed")
+
+        with self.assertRaisesRegex(RuntimeError, "close failed"):
+            list(read_ahead(Unclosable(), 1))
+
+    def test_early_close(self):
+        """Closing the consumer closes the source on the producer thread."""
+        source = Source(n=1000)
+        stream = read_ahead(source(), 1)
+        self.assertEqual(next(stream), 0)
+        stream.close()
+        self.assertTrue(source.closed)
+        self.assertIsNot(source.closed_on, threading.current_thread())
+
+
+class TestOffload(unittest.TestCase):
+    """Test suite for async_streams._offload."""
+
+    def test_yields_all_items(self):
+        """Every item arrives in order and the source is closed."""
+        source = Source()
+
+        async def run():
+            return [item async for item in _offload(source, 2)]
+
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+        self.assertTrue(source.closed)
+
+    def test_exception_is_reraised(self):
+        """An error in the source reaches the awaiting consumer."""
+        async def run():
+            return [item async for item in _offload(Source(fail_at=2))]
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            asyncio.run(run())
+
+    def test_early_close(self):
+        """aclose() closes the source on the worker thread."""
+        source = Source(n=1000)
+
+        async def run():
+            stream = _offload(source)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(run()), 0)
+        self.assertTrue(source.closed)
+        self.assertIsNot(source.closed_on, threading.current_thread())
+
+
+if __name__ == "__main__":
+    unittest.main()
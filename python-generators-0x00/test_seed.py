@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Unit tests for the server-independent helpers in seed."""
+
+import csv
+import gc
+import io
+import os
+import tempfile
+import unittest
+from contextlib import closing, redirect_stderr
+from unittest.mock import patch
+
+import mysql.connector
+
+import seed
+import sqlite_standin
+from sqlite_standin import connect
+
+
+class StubConnection:
+    """Raw connection stand-in that records pings, resets and closes."""
+
+    def __init__(self):
+        self.connected = True
+        self.unread_result = False
+        self.closed = False
+        self.pings = 0
+        self.resets = 0
+
+    def is_connected(self):
+        self.pings += 1
+        return self.connected
+
+    def cmd_reset_connection(self):
+        self.resets += 1
+        return self.connected
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test suite for ConnectionPool, with a stub connection factory."""
+
+    def setUp(self):
+        self.opened = []
+        patcher = patch.object(seed, "connection_stats", seed.Counter())
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def factory(self):
+        self.opened.append(StubConnection())
+        return self.opened[-1]
+
+    def pool(self, **options):
+        options.setdefault("timeout", 0.01)
+        return seed.ConnectionPool(self.factory, **options)
+
+    def test_exhaustion_times_out(self):
+        """Beyond max_size, acquire waits and then raises PoolError."""
+        pool = self.pool(max_size=1)
+        conn = pool.acquire()
+        with self.assertRaises(mysql.connector.errors.PoolError):
+            pool.acquire()
+        conn.close()
+        self.assertIsNotNone(pool.acquire())
+
+    def test_failing_factory_frees_its_slot(self):
+        """A connect error does not use up the pool."""
+        pool = seed.ConnectionPool(StubConnection, max_size=1, timeout=0.01)
+        with patch.object(pool, "_factory",
+                          side_effect=mysql.connector.Error("down")):
+            with self.assertRaises(mysql.connector.Error):
+                pool.acquire()
+        self.assertIsNotNone(pool.acquire())
+
+    def test_release_resets_without_ping(self):
+        """Released connections are reset, not pinged, and reused."""
+        pool = self.pool()
+        pool.acquire().close()
+        raw = self.opened[0]
+        self.assertEqual((raw.resets, raw.pings), (1, 0))
+        pool.acquire().close()
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.stats["reused"], 1)
+
+    def test_dirty_connections_are_discarded(self):
+        """Unread results or a failed reset mean a new connection next."""
+        pool = self.pool()
+        conn = pool.acquire()
+        conn.unread_result = True
+        conn.close()
+        conn = pool.acquire()
+        self.opened[1].connected = False
+        conn.close()
+        pool.acquire()
+        self.assertEqual(len(self.opened), 3)
+        self.assertTrue(self.opened[0].closed and self.opened[1].closed)
+        self.assertEqual(self.stats["discarded"], 2)
+
+    def test_idle_eviction(self):
+        """Connections idle past max_idle are closed, not reused."""
+        pool = self.pool(max_idle=0)
+        pool.acquire().close()
+        pool.acquire()
+        self.assertTrue(self.opened[0].closed)
+        self.assertEqual(self.stats["evicted"], 1)
+
+    def test_health_check_discards_dead_connections(self):
+        """An idle connection that fails its ping is replaced."""
+        pool = self.pool(check_after=0)
+        pool.acquire().close()
+        self.opened[0].connected = False
+        pool.acquire()
+        self.assertEqual(len(self.opened), 2)
+        self.assertTrue(self.opened[0].closed)
+
+    def test_release_after_close(self):
+        """Connections returned to a closed pool are closed."""
+        pool = self.pool()
+        conn = pool.acquire()
+        pool.close()
+        conn.close()
+        self.assertTrue(self.opened[0].closed)
+        with self.assertRaises(mysql.connector.errors.PoolError):
+            pool.acquire()
+
+    def test_collected_proxy_returns_its_slot(self):
+        """A checked-out connection that is dropped is released."""
+        pool = self.pool(max_size=1)
+        pool.acquire()          # never closed
+        gc.collect()
+        pool.acquire()
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.stats["orphaned"], 1)
+        self.assertEqual(self.opened[0].resets, 1)
+
+
+class TestKeyFormat(unittest.TestCase):
+    """Test suite for the CHAR(36) / BINARY(16) user_id helpers."""
+
+    def test_char_key_is_used_as_is(self):
+        """With the original schema user_id needs no conversion."""
+        with patch.object(seed, "_binary_key", False):
+            self.assertEqual(seed.user_columns(None),
+                             "user_id, name, email, age")
+            self.assertEqual(seed.build_where(None, user_id__gt="a"),
+                             (" WHERE user_id > %s", ("a",)))
+
+    def test_binary_key_is_converted(self):
+        """After migration ids are read and compared as text."""
+        with patch.object(seed, "_binary_key", True):
+            self.assertEqual(
+                seed.user_columns(object()),
+                "BIN_TO_UUID(user_id, 1) AS user_id, name, email, age")
+            self.assertEqual(
+                seed.build_where(object(), user_id__in=("a", "b"), age=30),
+                (" WHERE user_id IN (UUID_TO_BIN(%s, 1), UUID_TO_BIN(%s, 1))"
+                 " AND age = %s", ("a", "b", 30)))
+
+    def test_index_ddl(self):
+        """The duplicate key index is gone and age queries are covered."""
+        ddl = seed.user_data_ddl()
+        self.assertNotIn("INDEX (user_id)", ddl)
+        self.assertIn("INDEX idx_age (age, name, email)", ddl)
+        self.assertIn("BINARY(16) PRIMARY KEY",
+                      seed.user_data_ddl(binary_key=True))
+
+
+class TestAdaptiveFetchSize(unittest.TestCase):
+    """Test suite for the stream_user_data fetch size controller."""
+
+    @staticmethod
+    def run_fetches(sizing, cost, fetches=20):
+        """Feed *sizing* full batches whose time is cost(size) per row."""
+        for _ in range(fetches):
+            size = sizing.size
+            sizing.record([("id", "name", "email", 30)] * size,
+                          cost(size) * size)
+
+    def test_grows_while_per_row_time_improves(self):
+        """Per-row cost flattens out at 1024 rows, so growth stops there."""
+        sizing = seed.AdaptiveFetchSize(initial=16)
+        self.run_fetches(sizing, lambda size: 1 + 1000 / min(size, 1024))
+        self.assertTrue(sizing.settled)
+        self.assertEqual(sizing.size, 1024)
+        self.assertEqual([size for size, _ in sizing.history],
+                         [16, 32, 64, 128, 256, 512, 1024, 2048])
+
+    def test_memory_budget_caps_the_size(self):
+        """The batch never grows past what fits in the memory budget."""
+        sizing = seed.AdaptiveFetchSize(initial=16, memory_budget=64 * 1024)
+        self.run_fetches(sizing, lambda size: 1 / size)
+        row = seed._row_bytes(("id", "name", "email", 30))
+        self.assertTrue(sizing.settled)
+        self.assertLessEqual(sizing.size * row, 64 * 1024)
+
+    def test_short_final_batch_is_ignored(self):
+        """The last, partial batch of a result is not a measurement."""
+        sizing = seed.AdaptiveFetchSize(initial=64)
+        sizing.record([("id", "name", "email", 30)] * 10, 1.0)
+        self.assertEqual((sizing.size, sizing.history), (64, []))
+
+
+class TestSyncCsv(unittest.TestCase):
+    """Test suite for sync_csv, run on the SQLite stand-in."""
+
+    def setUp(self):
+        """An empty user_data and a CSV path in a scratch directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.csv")
+        self.conn = connect(":memory:")
+        patcher = patch.object(seed, "_binary_key", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        seed.create_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def write(self, *rows):
+        with open(self.path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["user_id", "name", "email", "age"])
+            writer.writerows(rows)
+
+    def test_only_differences_are_written(self):
+        """New rows insert, changed rows update, the rest is untouched."""
+        self.write(("a", "Ann", "ann@x", "30"), ("b", "Bob", "bob@x", "40"))
+        self.assertEqual(seed.sync_csv(self.conn, self.path),
+                         seed.SyncResult(2, 0, 0))
+
+        self.write(("a", "Ann", "ann@x", "30.0"),
+                   ("b", "Bobby", "bob@x", "40"),
+                   ("c", "Cy", "cy@x", "50"))
+        self.assertEqual(seed.sync_csv(self.conn, self.path, chunk_size=2),
+                         seed.SyncResult(1, 1, 1))
+        with closing(self.conn.cursor()) as cur:
+            cur.execute("SELECT name FROM user_data WHERE user_id = 'b'")
+            self.assertEqual(cur.fetchone(), ("Bobby",))
+
+    def test_last_duplicate_in_file_wins(self):
+        """A user_id repeated within a chunk keeps its last values."""
+        self.write(("a", "Old", "a@x", "30"), ("a", "New", "a@x", "30"))
+        self.assertEqual(seed.sync_csv(self.conn, self.path),
+                         seed.SyncResult(1, 0, 0))
+
+
+class TestLoadCsv(unittest.TestCase):
+    """Test suite for load_csv checkpoints, run on the SQLite stand-in."""
+
+    def setUp(self):
+        """An empty user_data and a three-row CSV in a scratch directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.csv")
+        self.conn = connect(":memory:")
+        patcher = patch.object(seed, "_binary_key", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        seed.create_table(self.conn)
+        with open(self.path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["user_id", "name", "email", "age"])
+            writer.writerows([("a", "Ann", "a@x", "30"),
+                              ("b", "Bob", "b@x", "40"),
+                              ("c", "Cy", "c@x", "50")])
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def set_checkpoint(self, rows_done):
+        """Record an interrupted run that committed *rows_done* rows."""
+        with closing(self.conn.cursor()) as cur:
+            seed._checkpoint(cur, seed._checkpoint_source(self.path))
+            cur.execute("INSERT INTO seed_checkpoint (source, rows_done) "
+                        "VALUES (%s, %s)",
+                        (seed._checkpoint_source(self.path), rows_done))
+
+    def test_resume_skips_committed_rows(self):
+        """Rows before the checkpoint are not read again."""
+        self.set_checkpoint(2)
+        self.assertEqual(seed.load_csv(self.conn, self.path), 1)
+
+    def test_modified_file_starts_over(self):
+        """A checkpoint of an earlier version of the file is ignored."""
+        self.set_checkpoint(2)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(seed.load_csv(self.conn, self.path), 3)
+
+    def test_without_resume(self):
+        """resume=False works before any checkpoint table exists."""
+        self.assertEqual(seed.load_csv(self.conn, self.path, resume=False),
+                         3)
+
+    def test_progress_line_is_left_to_the_caller(self):
+        """load_csv itself writes nothing to stderr."""
+        calls = []
+        with redirect_stderr(io.StringIO()) as err:
+            seed.load_csv(self.conn, self.path, chunk_size=2,
+                          progress=lambda *args: calls.append(args))
+        self.assertEqual(err.getvalue(), "")
+        self.assertEqual([done for done, _ in calls], [2, 3])
+
+
+class TestBulkLoad(unittest.TestCase):
+    """Test suite for the insert_data(bulk=True) path on the stand-in."""
+
+    def setUp(self):
+        """A stand-in database whose server refuses LOCAL INFILE."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        sqlite_standin.install(os.path.join(self.tmp.name, "db.sqlite"))
+        self.path = os.path.join(self.tmp.name, "users.csv")
+        with open(self.path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["user_id", "name", "email", "age"])
+            writer.writerows([("a", "Ann", "a@x", "30"),
+                              ("b", "Bob", "b@x", "40")])
+        with closing(seed.connect_to_prodev()) as conn:
+            seed.create_table(conn)
+
+    def test_fallback_reports_to_the_callers_progress(self):
+        """The batched fallback uses the progress callback passed in."""
+        calls = []
+        with closing(seed.connect_to_prodev(True)) as conn, \
+                redirect_stderr(io.StringIO()):
+            inserted = seed.bulk_load_csv(
+                conn, self.path, progress=lambda *args: calls.append(args))
+        self.assertEqual(inserted, 2)
+        self.assertEqual([done for done, _ in calls], [2])
+
+    def test_insert_data_uses_a_local_infile_connection(self):
+        """bulk=True asks for an allow_local_infile connection."""
+        real = seed.connect_to_prodev
+        requested = []
+
+        def spy(allow_local_infile=False):
+            requested.append(allow_local_infile)
+            return real(allow_local_infile)
+
+        with patch.object(seed, "connect_to_prodev", spy), \
+                closing(real()) as conn, redirect_stderr(io.StringIO()):
+            seed.insert_data(conn, self.path, bulk=True)
+        self.assertEqual(requested, [True])
+
+    def test_no_local_infile_connection(self):
+        """Failing to get one raises instead of loading without it."""
+        with patch.object(seed, "connect_to_prodev", return_value=None):
+            with self.assertRaises(ConnectionError):
+                seed.insert_data(None, self.path, bulk=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
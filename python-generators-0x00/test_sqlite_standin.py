@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Unit tests for the SQLite stand-in used by bench.py."""
+
+import unittest
+
+from mysql.connector import Error
+
+import seed
+from sqlite_standin import connect, translate
+
+
+class TestTranslate(unittest.TestCase):
+    """Test suite for the MySQL ➜ SQLite statement rewriting."""
+
+    def test_placeholders_and_insert_ignore(self):
+        """%s becomes ? and INSERT IGNORE becomes INSERT OR IGNORE."""
+        self.assertEqual(
+            translate("INSERT IGNORE INTO t (a) VALUES (%s)"),
+            ["INSERT OR IGNORE INTO t (a) VALUES (?)"])
+
+    def test_upsert(self):
+        """ON DUPLICATE KEY UPDATE maps onto ON CONFLICT DO UPDATE."""
+        self.assertEqual(
+            translate("INSERT INTO t (a, b) VALUES (%s, %s) "
+                      "ON DUPLICATE KEY UPDATE b = VALUES(b)"),
+            ["INSERT INTO t (a, b) VALUES (?, ?) "
+             "ON CONFLICT DO UPDATE SET b = excluded.b"])
+
+    def test_inline_indexes_are_split_out(self):
+        """Indexes declared in CREATE TABLE become CREATE INDEX statements."""
+        statements = translate(seed.user_data_ddl())
+        self.assertNotIn("INDEX", statements[0])
+        self.assertIn("CREATE INDEX IF NOT EXISTS idx_age ON user_data "
+                      "(age, name, email)", statements)
+
+    def test_database_statements_are_skipped(self):
+        """CREATE DATABASE / USE have no SQLite counterpart."""
+        self.assertEqual(translate("CREATE DATABASE IF NOT EXISTS x;"), [])
+
+
+class TestStandIn(unittest.TestCase):
+    """Test suite for the seed helpers running on the stand-in."""
+
+    def setUp(self):
+        """Give every test an empty in-memory database."""
+        self.conn = connect(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_create_table_and_rows(self):
+        """seed.create_table runs unchanged; dictionary cursors work."""
+        seed.create_table(self.conn)
+        cur = self.conn.cursor(dictionary=True)
+        cur.execute("INSERT INTO user_data (user_id, name, email, age) "
+                    "VALUES (%s, %s, %s, %s)", ("u1", "Ann", "a@x", 30))
+        cur.execute("SELECT user_id, age FROM user_data")
+        self.assertEqual(cur.fetchall(), [{"user_id": "u1", "age": 30}])
+
+    def test_errors_are_mysql_errors(self):
+        """sqlite3 errors surface as mysql.connector errors."""
+        with self.assertRaises(Error):
+            self.conn.cursor().execute("SELECT * FROM missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
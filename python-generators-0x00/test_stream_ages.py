@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Unit tests for 4-stream_ages."""
+
+import importlib
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from contextlib import closing
+
+import seed
+import sqlite_standin
+from bench import write_synthetic_csv
+
+ages = importlib.import_module("4-stream_ages")
+
+
+class TestRunningAgeStats(unittest.TestCase):
+    """Test suite for the one-pass RunningAgeStats."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.randint(18, 120) for _ in range(5000)]
+        self.stats = ages.RunningAgeStats(reservoir_size=10_000)
+        self.stats.add_many(self.values)
+
+    def test_matches_statistics_module(self):
+        """Welford's mean and variance agree with the two-pass results."""
+        self.assertAlmostEqual(self.stats.avg, statistics.mean(self.values))
+        self.assertAlmostEqual(self.stats.variance,
+                               statistics.variance(self.values))
+        self.assertAlmostEqual(self.stats.stdev,
+                               statistics.stdev(self.values))
+        self.assertEqual((self.stats.min, self.stats.max),
+                         (min(self.values), max(self.values)))
+
+    def test_percentiles(self):
+        """With every age in the reservoir percentiles are exact."""
+        self.assertEqual(self.stats.get("p0"), min(self.values))
+        self.assertEqual(self.stats.get("p100"), max(self.values))
+        self.assertEqual(self.stats.get("p50"),
+                         statistics.median(self.values))
+
+    def test_percentile_out_of_range(self):
+        """Percentiles outside 0-100 are rejected."""
+        for q in (-1, 100.5):
+            with self.assertRaises(ValueError):
+                self.stats.percentile(q)
+        with self.assertRaises(ValueError):
+            self.stats.get("p150")
+
+    def test_empty(self):
+        """Nothing seen: no average, no variance, no percentile."""
+        empty = ages.RunningAgeStats()
+        self.assertEqual((empty.count, empty.avg, empty.variance,
+                          empty.percentile(50)), (0, None, None, None))
+
+
+class TestAggregateAges(unittest.TestCase):
+    """Test suite for aggregate_ages, run on the SQLite stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Seed 300 synthetic users into a stand-in database."""
+        cls.tmp = tempfile.TemporaryDirectory()
+        sqlite_standin.install(os.path.join(cls.tmp.name, "db.sqlite"))
+        csv_path = os.path.join(cls.tmp.name, "users.csv")
+        write_synthetic_csv(csv_path, 300)
+        with closing(seed.connect_to_prodev()) as conn:
+            seed.create_table(conn)
+            seed.load_csv(conn, csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_sql_and_streamed_results_agree(self):
+        """Both paths return the same values with the same types."""
+        names = ("avg", "count", "sum", "min", "max")
+        in_sql = ages.aggregate_ages(*names, age__gt=40)
+        streamed = ages.aggregate_ages(*names, in_sql=False, age__gt=40)
+        self.assertEqual(in_sql.keys(), streamed.keys())
+        for name in names:
+            self.assertAlmostEqual(in_sql[name], streamed[name])
+            self.assertIs(type(in_sql[name]), type(streamed[name]))
+        self.assertIsInstance(in_sql["count"], int)
+        self.assertIsInstance(in_sql["avg"], float)
+
+
+if __name__ == "__main__":
+    unittest.main()